@@ -0,0 +1,201 @@
+"""
+Rendu hors ligne du synthétiseur vers un fichier WAV, sans carte son
+
+Usage : python render.py notes.json [--sortie rendu.wav] [--preset Pad Lead]
+                         [--bits 16|32] [--bloc 8192] [--traine 1.0]
+        python render.py morceau.mid --preset tous
+
+Les notes sont un fichier MIDI standard (.mid, formats 0 et 1) ou une liste
+JSON de notes : [{"debut": 0.0, "duree": 0.5, "note": 60}, ...], où "note"
+est un numéro de note MIDI (ou "frequence" en Hz à la place).
+
+La chaîne de traitement est celle du synthétiseur (oscillateurs, ADSR,
+filtre, delay), calculée par grands blocs et écrite au fil de l'eau. Avec
+plusieurs presets, chaque rendu va dans <sortie>_<preset>.wav. Le facteur
+temps réel affiché est la durée rendue divisée par le temps de calcul.
+"""
+
+import argparse
+import json
+import os
+import struct
+import time
+import wave
+
+from synthesizer import Synthesizer, PRESETS, SAMPLE_RATE, CHANNELS, RENDER_BLOCK_SIZE
+
+
+def midi_to_freq(note):
+    """Fréquence d'une note MIDI (69 = La 440 Hz)"""
+    return 440.0 * 2 ** ((note - 69) / 12)
+
+
+# ---------- Lecture des notes ----------
+
+def load_notes(path):
+    """Événements (temps en s, 'note_on' ou 'note_off', fréquence) d'une liste JSON de notes"""
+    with open(path, encoding='utf-8') as f:
+        notes = json.load(f)
+    
+    events = []
+    for note in notes:
+        freq = note['frequence'] if 'frequence' in note else midi_to_freq(note['note'])
+        events.append((note['debut'], 'note_on', freq))
+        events.append((note['debut'] + note['duree'], 'note_off', freq))
+    return events
+
+
+def _read_varlen(data, pos):
+    """Entier à longueur variable du format MIDI : (valeur, position suivante)"""
+    value = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            return value, pos
+
+
+def _read_track(data):
+    """Événements d'une piste : (tick absolu, type, valeur) pour les notes et le tempo"""
+    events = []
+    tick = 0
+    pos = 0
+    status = 0
+    while pos < len(data):
+        delta, pos = _read_varlen(data, pos)
+        tick += delta
+        
+        if data[pos] == 0xFF:
+            # Méta-événement : ne modifie pas le running status
+            meta = data[pos + 1]
+            length, pos = _read_varlen(data, pos + 2)
+            if meta == 0x51:
+                events.append((tick, 'tempo', int.from_bytes(data[pos:pos + length], 'big')))
+            elif meta == 0x2F:
+                break
+            pos += length
+        elif data[pos] in (0xF0, 0xF7):
+            # Sysex : ne modifie pas non plus le running status
+            length, pos = _read_varlen(data, pos + 1)
+            pos += length
+        else:
+            if data[pos] & 0x80:
+                status = data[pos]
+                pos += 1
+            # Sinon : running status, on réutilise le statut précédent
+            
+            kind = status & 0xF0
+            if kind in (0xC0, 0xD0):
+                pos += 1
+                continue
+            note, velocity = data[pos], data[pos + 1]
+            pos += 2
+            if kind == 0x90 and velocity > 0:
+                events.append((tick, 'note_on', note))
+            elif kind == 0x80 or kind == 0x90:
+                events.append((tick, 'note_off', note))
+    return events
+
+
+def load_midi(path):
+    """Événements (temps en s, 'note_on' ou 'note_off', fréquence) d'un fichier MIDI"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:4] != b'MThd':
+        raise ValueError(f"{path} n'est pas un fichier MIDI")
+    
+    header_length = struct.unpack('>I', data[4:8])[0]
+    _, track_count, division = struct.unpack('>HHH', data[8:14])
+    if division & 0x8000:
+        raise ValueError("Division temporelle SMPTE non prise en charge")
+    
+    # Pistes fusionnées dans l'ordre des ticks (le tempo d'abord à tick égal)
+    ticks = []
+    pos = 8 + header_length
+    for _ in range(track_count):
+        chunk_type, length = data[pos:pos + 4], struct.unpack('>I', data[pos + 4:pos + 8])[0]
+        if chunk_type == b'MTrk':
+            ticks.extend(_read_track(data[pos + 8:pos + 8 + length]))
+        pos += 8 + length
+    ticks.sort(key=lambda e: (e[0], e[1] != 'tempo'))
+    
+    events = []
+    tempo = 500000  # µs par noire (120 BPM)
+    last_tick = 0
+    seconds = 0.0
+    for tick, event_type, value in ticks:
+        seconds += (tick - last_tick) * tempo / (division * 1e6)
+        last_tick = tick
+        if event_type == 'tempo':
+            tempo = value
+        else:
+            events.append((seconds, event_type, midi_to_freq(value)))
+    return events
+
+
+# ---------- Rendu ----------
+
+def render_to_wav(events, path, preset=None, bits=16, block_size=RENDER_BLOCK_SIZE, tail=1.0):
+    """Rend les événements dans un fichier WAV ; retourne (durée rendue, temps de calcul) en s"""
+    synth = Synthesizer()
+    if preset:
+        synth.load_preset(preset)
+    scale, dtype = (32767, '<i2') if bits == 16 else (2147483647, '<i4')
+    
+    frames = 0
+    compute_time = 0.0
+    with wave.open(path, 'wb') as out:
+        out.setnchannels(CHANNELS)
+        out.setsampwidth(bits // 8)
+        out.setframerate(SAMPLE_RATE)
+        
+        blocks = synth.render(events, tail=tail, block_size=block_size)
+        while True:
+            start = time.perf_counter()
+            block = next(blocks, None)
+            compute_time += time.perf_counter() - start
+            if block is None:
+                break
+            out.writeframes((block * scale).astype(dtype).tobytes())
+            frames += len(block)
+    return frames / SAMPLE_RATE, compute_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rendu hors ligne du synthétiseur en WAV")
+    parser.add_argument('entree', help="notes à jouer : fichier MIDI (.mid) ou liste JSON")
+    parser.add_argument('--sortie', help="fichier WAV à écrire (par défaut : nom de l'entrée)")
+    parser.add_argument('--preset', nargs='+', metavar='NOM',
+                        help="preset(s) à rendre (" + ", ".join(PRESETS) + ", ou tous)")
+    parser.add_argument('--bits', type=int, choices=[16, 32], default=16,
+                        help="résolution des échantillons")
+    parser.add_argument('--bloc', type=int, default=RENDER_BLOCK_SIZE,
+                        help="taille des blocs de rendu (échantillons)")
+    parser.add_argument('--traine', type=float, default=1.0,
+                        help="durée rendue après le silence des voix, pour les échos (s)")
+    args = parser.parse_args()
+    
+    if os.path.splitext(args.entree)[1].lower() in ('.mid', '.midi'):
+        events = load_midi(args.entree)
+    else:
+        events = load_notes(args.entree)
+    
+    presets = args.preset or [None]
+    if presets == ['tous']:
+        presets = list(PRESETS)
+    unknown = [name for name in presets if name is not None and name not in PRESETS]
+    if unknown:
+        parser.error("preset(s) inconnu(s) : " + ", ".join(unknown))
+    
+    stem = os.path.splitext(args.sortie or args.entree)[0]
+    for preset in presets:
+        path = f"{stem}_{preset}.wav" if len(presets) > 1 else f"{stem}.wav"
+        duration, compute_time = render_to_wav(events, path, preset, args.bits, args.bloc,
+                                               args.traine)
+        print(f"{path} : {duration:.1f} s rendues en {compute_time:.2f} s "
+              f"({duration / max(compute_time, 1e-9):.0f} fois le temps réel)")
+
+
+if __name__ == '__main__':
+    main()
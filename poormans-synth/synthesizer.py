@@ -7,7 +7,7 @@ import tkinter as tk
 from tkinter import ttk
 import numpy as np
 import threading
-import queue
+import time
 import struct
 import math
 
@@ -28,7 +28,21 @@ except ImportError:
 # Constantes audio
 SAMPLE_RATE = 44100
 BUFFER_SIZE = 1024
+BUFFER_SIZES = (128, 256, 512, 1024)  # tailles de bloc proposées (latence / marge CPU)
 CHANNELS = 1
+POLYPHONY = 16  # voix simultanées
+RENDER_BLOCK_SIZE = 8192  # taille des blocs du rendu hors ligne
+EVENT_QUEUE_SIZE = 1024  # événements en attente entre l'interface et le thread audio
+
+# Tables d'onde : une période de WAVETABLE_SIZE points par niveau de mip-map,
+# chaque niveau gardant deux fois moins d'harmoniques que le précédent
+WAVETABLE_SIZE = 2048
+WAVETABLE_LEVELS = 11  # 1024 harmoniques au niveau 0, 1 au dernier
+
+# Filtre : taille des sous-blocs à coefficients constants et constante de temps
+# du lissage de la fréquence de coupure (s)
+FILTER_SUBBLOCK = 128
+CUTOFF_SMOOTHING = 0.01
 
 # Couleurs du thème
 COLORS = {
@@ -43,128 +57,371 @@ COLORS = {
 }
 
 
+def _harmonic_spectrum(waveform, harmonics):
+    """Spectre (rfft) d'une période de WAVETABLE_SIZE points limitée à `harmonics` harmoniques.
+    
+    Les séries de Fourier reproduisent les formes naïves : dent de scie montante
+    de -1 à 1, carré = signe du sinus, triangle partant de 1 en phase 0.
+    """
+    spectrum = np.zeros(WAVETABLE_SIZE // 2 + 1, dtype=complex)
+    n = np.arange(1, harmonics + 1)
+    odd = n[n % 2 == 1]
+    scale = WAVETABLE_SIZE / 2
+    
+    if waveform == 'sawtooth':
+        spectrum[n] = 1j * (2 / np.pi) / n * scale  # -(2/π) Σ sin(nθ)/n
+    elif waveform == 'square':
+        spectrum[odd] = -1j * (4 / np.pi) / odd * scale  # (4/π) Σ sin(nθ)/n, n impair
+    elif waveform == 'triangle':
+        spectrum[odd] = (8 / np.pi ** 2) / odd ** 2 * scale  # (8/π²) Σ cos(nθ)/n², n impair
+    else:
+        spectrum[1] = -1j * scale  # sinus pur
+    return spectrum
+
+
+def _build_wavetables():
+    """Tables à bande limitée {forme: tableau (niveaux, WAVETABLE_SIZE + 1)}.
+    
+    Le point supplémentaire recopie le premier pour interpoler sans modulo.
+    """
+    tables = {}
+    for waveform in ('sine', 'square', 'sawtooth', 'triangle'):
+        levels = np.empty((WAVETABLE_LEVELS, WAVETABLE_SIZE + 1))
+        for level in range(WAVETABLE_LEVELS):
+            harmonics = max(1, (WAVETABLE_SIZE // 2) >> level)
+            levels[level, :-1] = np.fft.irfft(_harmonic_spectrum(waveform, harmonics),
+                                              WAVETABLE_SIZE)
+            levels[level, -1] = levels[level, 0]
+        tables[waveform] = levels
+    return tables
+
+
+WAVETABLES = _build_wavetables()
+
+
 class Oscillator:
-    """Générateur de formes d'onde"""
+    """Oscillateurs à tables d'onde à bande limitée (mip-map par octave), un par voix.
     
-    def __init__(self, sample_rate=SAMPLE_RATE):
-        self.sample_rate = sample_rate
-        self.phase = 0.0
+    La phase de chaque voix est un accumulateur en fractions de période, rangé
+    dans un tableau NumPy ; un bloc est calculé pour toutes les voix demandées
+    d'un coup, chacune lisant la table dont les harmoniques restent sous Nyquist,
+    avec interpolation linéaire. Les tampons de travail sont alloués une fois et
+    réutilisés : le tableau renvoyé par generate() est écrasé à l'appel suivant.
+    """
     
-    def generate(self, frequency, num_samples, waveform='sine'):
-        """Génère des échantillons audio"""
-        t = np.arange(num_samples) / self.sample_rate
-        phase_increment = 2 * np.pi * frequency / self.sample_rate
-        phases = self.phase + np.cumsum(np.full(num_samples, phase_increment))
-        self.phase = phases[-1] % (2 * np.pi)
-        
-        if waveform == 'sine':
-            return np.sin(phases)
-        elif waveform == 'square':
-            return np.sign(np.sin(phases))
-        elif waveform == 'sawtooth':
-            return 2 * (phases / (2 * np.pi) % 1) - 1
-        elif waveform == 'triangle':
-            return 2 * np.abs(2 * (phases / (2 * np.pi) % 1) - 1) - 1
-        elif waveform == 'noise':
-            return np.random.uniform(-1, 1, num_samples)
+    def __init__(self, sample_rate=SAMPLE_RATE, voices=1):
+        self.sample_rate = sample_rate
+        self.phase = np.zeros(voices)  # en périodes, dans [0, 1)
+        self.rng = np.random.default_rng()
+        self._allocate(voices * BUFFER_SIZE)
+    
+    def _allocate(self, size):
+        # Tampons à plat, vus en (voix, échantillons) contigus à chaque bloc
+        self._ramp = np.arange(1, size + 1, dtype=float)
+        self._phases = np.empty(size)
+        self._index = np.empty(size, dtype=np.intp)
+        self._frac = np.empty(size)
+        self._out = np.empty(size)
+    
+    def table_level(self, frequency):
+        """Niveaux de mip-map dont la plus haute harmonique reste sous Nyquist"""
+        allowed = self.sample_rate / 2 / np.maximum(np.abs(frequency), 1e-6)
+        level = np.ceil(np.log2((WAVETABLE_SIZE // 2) / allowed))
+        return np.clip(level, 0, WAVETABLE_LEVELS - 1).astype(np.intp)
+    
+    def generate(self, frequency, num_samples, waveform='sine', voices=None):
+        """Génère un bloc (voix, échantillons) pour les voix `voices` (toutes par défaut).
+        
+        `frequency` est un scalaire, un tableau d'une fréquence par voix ou un
+        tableau (voix, échantillons) d'une fréquence par échantillon, dont
+        l'incrément de phase est intégré par somme cumulée.
+        """
+        if voices is None:
+            voices = np.arange(len(self.phase))
+        shape = (len(voices), num_samples)
+        size = shape[0] * num_samples
+        if size > len(self._out):
+            self._allocate(size)
+        out = self._out[:size].reshape(shape)
+        
+        if waveform == 'noise':
+            self.rng.random(shape, out=out)
+            out *= 2
+            out -= 1
+            return out
+        
+        # Accumulateur de phase : phase + somme des incréments, en points de table.
+        # Le repli sur une période se fait sur l'indice entier (taille en puissance de 2).
+        increment = np.asarray(frequency, dtype=float) / self.sample_rate
+        phases = self._phases[:size].reshape(shape)
+        if increment.ndim == 2:
+            np.cumsum(increment, axis=1, out=phases)
+            phases *= WAVETABLE_SIZE
+            increment = np.abs(increment).max(axis=1)  # la plus haute fréquence fixe la table
         else:
-            return np.sin(phases)
-    
-    def reset(self):
-        self.phase = 0.0
+            increment = np.broadcast_to(increment, shape[:1])
+            np.multiply(self._ramp[:num_samples], increment[:, None] * WAVETABLE_SIZE, out=phases)
+        phases += self.phase[voices, None] * WAVETABLE_SIZE
+        self.phase[voices] = np.mod(phases[:, -1] / WAVETABLE_SIZE, 1.0)
+        
+        # Lecture interpolée dans la table du niveau adapté à la fréquence de chaque voix
+        tables = WAVETABLES.get(waveform, WAVETABLES['sine'])
+        index = self._index[:size].reshape(shape)
+        frac = self._frac[:size].reshape(shape)
+        np.floor(phases, out=frac)
+        index[:] = frac
+        np.subtract(phases, frac, out=frac)
+        index &= WAVETABLE_SIZE - 1
+        index += (self.table_level(increment * self.sample_rate) * tables.shape[1])[:, None]
+        table = tables.ravel()
+        np.take(table, index, out=phases)
+        index += 1
+        np.take(table, index, out=out)
+        out -= phases
+        out *= frac
+        out += phases
+        return out
+    
+    def reset(self, voice=None):
+        if voice is None:
+            self.phase[:] = 0.0
+        else:
+            self.phase[voice] = 0.0
 
 
 class ADSREnvelope:
-    """Enveloppe ADSR (Attack, Decay, Sustain, Release)"""
+    """Enveloppes ADSR (Attack, Decay, Sustain, Release) d'un ensemble de voix.
     
-    def __init__(self, sample_rate=SAMPLE_RATE):
+    Les réglages sont communs à toutes les voix ; l'état et le niveau de chaque
+    voix sont rangés dans des tableaux NumPy.
+    """
+    
+    IDLE, ATTACK, DECAY, SUSTAIN, RELEASE = range(5)
+    NEXT_STATE = np.array([IDLE, DECAY, SUSTAIN, SUSTAIN, IDLE], dtype=np.int8)
+    
+    def __init__(self, sample_rate=SAMPLE_RATE, voices=1):
         self.sample_rate = sample_rate
         self.attack = 0.01  # secondes
         self.decay = 0.1
         self.sustain = 0.7  # niveau (0-1)
         self.release = 0.3
         
-        self.state = 'idle'  # idle, attack, decay, sustain, release
-        self.level = 0.0
-        self.release_level = 0.0
-    
-    def note_on(self):
-        self.state = 'attack'
-        self.level = 0.0
-    
-    def note_off(self):
-        if self.state != 'idle':
-            self.state = 'release'
-            self.release_level = self.level
-    
-    def process(self, num_samples):
-        """Génère l'enveloppe pour un bloc d'échantillons"""
-        envelope = np.zeros(num_samples)
-        
-        for i in range(num_samples):
-            if self.state == 'idle':
-                self.level = 0.0
+        self.state = np.full(voices, self.IDLE, dtype=np.int8)
+        self.level = np.zeros(voices)
+        self.release_level = np.zeros(voices)
+    
+    def note_on(self, voice=0):
+        self.state[voice] = self.ATTACK
+        self.level[voice] = 0.0
+    
+    def note_off(self, voice=0):
+        if self.state[voice] != self.IDLE:
+            self.state[voice] = self.RELEASE
+            self.release_level[voice] = self.level[voice]
+    
+    def active(self):
+        """Indices des voix dont l'enveloppe n'est pas au repos"""
+        return np.flatnonzero(self.state != self.IDLE)
+    
+    def process(self, num_samples, voices=None):
+        """Génère l'enveloppe (voix, échantillons) des voix `voices` (toutes par défaut).
+        
+        Chaque tour de boucle avance toutes les voix d'un segment d'état
+        constant. Une rampe est, ligne par ligne, la somme cumulée de
+        l'incrément depuis le niveau courant (np.cumsum additionne dans l'ordre,
+        comme la boucle échantillon par échantillon : mêmes valeurs au bit
+        près) ; la transition est le premier échantillon qui franchit la cible,
+        forcé sur la cible. Une voix change d'état au plus trois fois par bloc,
+        la boucle fait donc peu de tours.
+        """
+        if voices is None:
+            voices = np.arange(len(self.state))
+        envelope = np.empty((len(voices), num_samples))
+        state = self.state[voices]
+        level = self.level[voices]
+        release_level = self.release_level[voices]
+        pos = np.zeros(len(voices), dtype=np.intp)  # premier échantillon à calculer
+        columns = np.arange(num_samples + 1)
+        
+        # Par état : cible, amplitude de la rampe complète et sa durée (0 : constant)
+        targets = np.array([0.0, 1.0, self.sustain, self.sustain, 0.0])
+        amplitudes = np.array([0.0, 1.0, -(1.0 - self.sustain), 0.0, 0.0])
+        durations = np.array([0.0, self.attack, self.decay, 0.0, self.release]) * self.sample_rate
+        
+        while True:
+            todo = np.flatnonzero(pos < num_samples)
+            if not todo.size:
+                break
+            rows = np.arange(todo.size)
+            st = state[todo]
+            start = pos[todo]
+            target = targets[st]
+            steady = (st == self.IDLE) | (st == self.SUSTAIN)
+            if steady.all() and not start.any():
+                # Niveaux constants (sustain, repos) sur tout le bloc
+                envelope[todo] = target[:, None]
+                level[todo] = target
+                break
             
-            elif self.state == 'attack':
-                if self.attack > 0:
-                    self.level += 1.0 / (self.attack * self.sample_rate)
-                else:
-                    self.level = 1.0
-                if self.level >= 1.0:
-                    self.level = 1.0
-                    self.state = 'decay'
+            # Incrément par échantillon (nul pour les états constants, qui restent sur leur cible)
+            duration = durations[st]
+            amplitude = np.where(st == self.RELEASE, -release_level[todo], amplitudes[st])
+            step = np.where(duration > 0, amplitude / np.where(duration > 0, duration, 1.0), 0.0)
             
-            elif self.state == 'decay':
-                if self.decay > 0:
-                    self.level -= (1.0 - self.sustain) / (self.decay * self.sample_rate)
-                else:
-                    self.level = self.sustain
-                if self.level <= self.sustain:
-                    self.level = self.sustain
-                    self.state = 'sustain'
+            # Colonne `start` : niveau de départ, puis les incréments ; zéros avant
+            # (0 + niveau = niveau exactement). ramp[:, k] est l'échantillon k.
+            increments = np.where(columns > start[:, None], step[:, None], 0.0)
+            increments[rows, start] = np.where(steady, target, level[todo])
+            ramp = np.cumsum(increments, axis=1)[:, 1:]
             
-            elif self.state == 'sustain':
-                self.level = self.sustain
+            # Premier échantillon qui atteint la cible ; dès `start` pour une durée nulle
+            crossed = np.where((st == self.ATTACK)[:, None],
+                               ramp >= target[:, None], ramp <= target[:, None])
+            crossed &= columns[:-1] >= start[:, None]
+            crossed[steady] = False
+            instant = ~steady & (duration <= 0)
+            crossed[rows[instant], start[instant]] = True
+            done = crossed.any(axis=1)
+            end = np.where(done, crossed.argmax(axis=1), num_samples)
             
-            elif self.state == 'release':
-                if self.release > 0:
-                    self.level -= self.release_level / (self.release * self.sample_rate)
-                else:
-                    self.level = 0.0
-                if self.level <= 0.0:
-                    self.level = 0.0
-                    self.state = 'idle'
+            # Les colonnes avant `start` sont ignorées ; celles après la transition
+            # sont écrasées par le segment suivant au tour d'après.
+            ramp[rows[done], end[done]] = target[done]
+            if not start.any():
+                envelope[todo] = ramp
+            else:
+                block = envelope[todo]
+                np.copyto(block, ramp, where=columns[:-1] >= start[:, None])
+                envelope[todo] = block
             
-            envelope[i] = self.level
+            state[todo[done]] = self.NEXT_STATE[st[done]]
+            level[todo] = np.where(done, target, ramp[:, -1])
+            pos[todo] = np.where(done, end + 1, num_samples)
         
+        self.state[voices] = state
+        self.level[voices] = level
         return envelope
 
 
+def _first_order_scan(poles, samples, state):
+    """Récurrence y[n] = pole * y[n-1] + x[n] sur chaque ligne, enchaînées en une seule.
+    
+    `samples` est un tableau (sous-blocs, longueur) et `poles` le pôle de chaque
+    sous-bloc. Chaque ligne est d'abord filtrée depuis un état nul par balayage
+    préfixe (après l'étape de décalage d, y[n] contient les termes x[n-k] pour
+    k < 2d : log2(longueur) opérations NumPy pour toutes les lignes). La
+    réponse à l'état de départ, pole^(n+1) * état, est ensuite ajoutée ligne par
+    ligne, l'état d'une ligne étant la dernière sortie de la précédente
+    (`state` pour la première).
+    """
+    rows, length = samples.shape
+    y = samples.copy()
+    factor = poles[:, None].copy()
+    shift = 1
+    while shift < length:
+        y[:, shift:] += factor * y[:, :-shift]
+        factor *= factor
+        shift *= 2
+    
+    decay = np.cumprod(np.broadcast_to(poles[:, None], (rows, length)), axis=1)
+    for row in range(rows):
+        y[row] += state * decay[row]
+        state = y[row, -1]
+    return y
+
+
 class Filter:
-    """Filtre passe-bas simple"""
+    """Filtre résonant biquad : passe-bas, passe-haut ou passe-bande.
+    
+    Coefficients du « Audio EQ Cookbook » (RBJ). Avec Q >= 0.707 les deux
+    pôles sont complexes conjugués p et p̄ : 1 / ((1 - p z⁻¹)(1 - p̄ z⁻¹)) se
+    décompose en A / (1 - p z⁻¹) + Ā / (1 - p̄ z⁻¹), A = p / (p - p̄), et pour
+    une entrée réelle la sortie vaut 2 Re(A s) où s est la sortie d'un seul
+    pôle complexe, calculée par _first_order_scan après le numérateur.
+    L'état (deux dernières entrées, état du pôle) est conservé d'un bloc à
+    l'autre ; la coupure est lissée à chaque sous-bloc.
+    """
+    
+    MODES = ('lowpass', 'highpass', 'bandpass')
     
     def __init__(self, sample_rate=SAMPLE_RATE):
         self.sample_rate = sample_rate
         self.cutoff = 5000  # Hz
-        self.resonance = 0.5
-        self.prev_sample = 0.0
-    
-    def process(self, samples):
-        """Applique le filtre"""
-        rc = 1.0 / (2 * np.pi * self.cutoff)
-        dt = 1.0 / self.sample_rate
-        alpha = dt / (rc + dt)
-        
-        output = np.zeros_like(samples)
-        for i, sample in enumerate(samples):
-            self.prev_sample = self.prev_sample + alpha * (sample - self.prev_sample)
-            output[i] = self.prev_sample + self.resonance * (sample - self.prev_sample)
-        
-        return output
+        self.resonance = 0.5  # 0-1, facteur Q de 0.707 (sans bosse) à ~11
+        self.mode = 'lowpass'
+        
+        self.smoothed_cutoff = float(self.cutoff)
+        self.input_history = np.zeros(2)  # x[n-2], x[n-1]
+        self.pole_state = 0j
+    
+    def q_factor(self):
+        return math.sqrt(0.5) * 16 ** self.resonance
+    
+    def coefficients(self, cutoff):
+        """(b0, b1, b2) normalisés par a0, pôle p (partie imaginaire > 0) et résidu A"""
+        w0 = 2 * math.pi * min(max(cutoff, 10.0), 0.45 * self.sample_rate) / self.sample_rate
+        cos_w0 = math.cos(w0)
+        sin_w0 = math.sin(w0)
+        alpha = sin_w0 / (2 * self.q_factor())
+        
+        if self.mode == 'highpass':
+            b = ((1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2)
+        elif self.mode == 'bandpass':
+            b = (alpha, 0.0, -alpha)  # gain de 0 dB au centre
+        else:
+            b = ((1 - cos_w0) / 2, 1 - cos_w0, (1 - cos_w0) / 2)
+        
+        # Racines de a0 z² - 2 cos(w0) z + (1 - alpha) : discriminant alpha² - sin² < 0
+        a0 = 1 + alpha
+        pole = complex(cos_w0, math.sqrt(sin_w0 * sin_w0 - alpha * alpha)) / a0
+        residue = pole / (pole - pole.conjugate())
+        return tuple(c / a0 for c in b), pole, residue
+    
+    def process(self, samples, modulation=None):
+        """Applique le filtre.
+        
+        `modulation` est un facteur de coupure par échantillon (LFO), lu au
+        début de chaque sous-bloc.
+        """
+        num_samples = len(samples)
+        if num_samples == 0:
+            return np.zeros(0)
+        rows = -(-num_samples // FILTER_SUBBLOCK)
+        smoothing = 1 - math.exp(-FILTER_SUBBLOCK / (CUTOFF_SMOOTHING * self.sample_rate))
+        
+        # Coefficients de chaque sous-bloc, la coupure étant lissée en octaves
+        b = np.empty((rows, 3))
+        poles = np.empty(rows, dtype=complex)
+        residues = np.empty((rows, 1), dtype=complex)
+        targets = np.full(rows, float(self.cutoff))
+        if modulation is not None:
+            targets *= modulation[::FILTER_SUBBLOCK]
+        for row, target in enumerate(np.maximum(targets, 10.0).tolist()):
+            self.smoothed_cutoff *= (target / self.smoothed_cutoff) ** smoothing
+            b[row], poles[row], residues[row, 0] = self.coefficients(self.smoothed_cutoff)
+        
+        # Numérateur (FIR) prolongé par les deux entrées du bloc précédent ; le
+        # dernier sous-bloc est complété par des zéros (sorties ignorées)
+        padded = np.zeros(rows * FILTER_SUBBLOCK + 2)
+        padded[:2] = self.input_history
+        padded[2:num_samples + 2] = samples
+        self.input_history = padded[num_samples:num_samples + 2].copy()
+        shape = (rows, FILTER_SUBBLOCK)
+        v = (b[:, 0:1] * padded[2:].reshape(shape)
+             + b[:, 1:2] * padded[1:-1].reshape(shape)
+             + b[:, 2:3] * padded[:-2].reshape(shape)).astype(complex)
+        
+        # Pôle complexe, puis recombinaison avec son conjugué
+        s = _first_order_scan(poles, v, self.pole_state)
+        self.pole_state = complex(s.flat[num_samples - 1])
+        s *= residues
+        return 2 * s.real.ravel()[:num_samples]
 
 
 class LFO:
-    """Low Frequency Oscillator pour modulation"""
+    """Low Frequency Oscillator pour modulation de la hauteur, de la coupure ou du volume"""
+    
+    TARGETS = ('pitch', 'cutoff', 'amplitude')
     
     def __init__(self, sample_rate=SAMPLE_RATE):
         self.sample_rate = sample_rate
@@ -172,6 +429,7 @@ class LFO:
         self.depth = 0.0  # 0-1
         self.phase = 0.0
         self.waveform = 'sine'
+        self.target = 'pitch'
     
     def process(self, num_samples):
         """Génère le signal LFO"""
@@ -195,7 +453,13 @@ class LFO:
 
 
 class Delay:
-    """Effet Delay/Echo"""
+    """Effet Delay/Echo sur tampon circulaire, traité par tranches.
+    
+    Le retard est fractionnaire (lecture interpolée linéairement) et glisse
+    linéairement vers la nouvelle durée sur un bloc quand `time` change. Une
+    tranche ne dépasse jamais le retard : ses lectures ne visent que des
+    échantillons écrits avant elle, et elle s'écrit d'une seule copie.
+    """
     
     def __init__(self, sample_rate=SAMPLE_RATE):
         self.sample_rate = sample_rate
@@ -205,64 +469,255 @@ class Delay:
         self.buffer_size = int(sample_rate * 2)  # 2 sec max
         self.buffer = np.zeros(self.buffer_size)
         self.write_pos = 0
+        self.current_delay = self.time * sample_rate  # en échantillons
     
     def process(self, samples):
         if self.mix == 0:
             return samples
         
-        delay_samples = int(self.time * self.sample_rate)
-        output = np.zeros_like(samples)
-        
-        for i, sample in enumerate(samples):
-            read_pos = (self.write_pos - delay_samples) % self.buffer_size
-            delayed = self.buffer[read_pos]
+        num_samples = len(samples)
+        target = min(max(self.time * self.sample_rate, 2.0), self.buffer_size - num_samples - 2)
+        delays = np.linspace(self.current_delay, target, num_samples + 1)[1:]
+        self.current_delay = target
+        output = np.empty(num_samples)
+        
+        start = 0
+        while start < num_samples:
+            # Le retard le plus court de la rampe restante borne la tranche
+            length = min(num_samples - start, int(min(delays[start], target)) - 1)
+            end = start + length
             
-            output[i] = sample * (1 - self.mix) + delayed * self.mix
-            self.buffer[self.write_pos] = sample + delayed * self.feedback
-            self.write_pos = (self.write_pos + 1) % self.buffer_size
+            # Lecture interpolée à write_pos + k - retard
+            positions = np.arange(self.write_pos, self.write_pos + length) - delays[start:end]
+            index = np.floor(positions)
+            frac = positions - index
+            index = index.astype(np.intp) % self.buffer_size
+            current = self.buffer[index]
+            following = self.buffer[(index + 1) % self.buffer_size]
+            delayed = current + frac * (following - current)
+            
+            chunk = samples[start:end]
+            output[start:end] = chunk * (1 - self.mix) + delayed * self.mix
+            self._write(chunk + delayed * self.feedback)
+            start = end
         
         return output
+    
+    def _write(self, values):
+        """Écrit `values` à write_pos, en deux copies si la fin du tampon est atteinte"""
+        first = min(len(values), self.buffer_size - self.write_pos)
+        self.buffer[self.write_pos:self.write_pos + first] = values[:first]
+        self.buffer[:len(values) - first] = values[first:]
+        self.write_pos = (self.write_pos + len(values)) % self.buffer_size
 
 
 class Arpeggiator:
-    """Arpégiateur simple"""
+    """Arpégiateur : ses pas sont des notes déclenchées à l'échantillon près.
     
-    def __init__(self):
+    Les touches tenues forment l'accord arpégé (une seule touche : l'accord
+    `chord` construit sur elle). Chaque pas est un note_on suivi d'un note_off
+    après `gate` fois la durée du pas ; `swing` allonge les pas pairs et
+    raccourcit les impairs d'autant. La durée d'un pas vient du tempo si
+    `sync` est actif (`division` pas par temps), sinon de `speed`.
+    """
+    
+    def __init__(self, sample_rate=SAMPLE_RATE):
+        self.sample_rate = sample_rate
         self.enabled = False
         self.speed = 8  # notes par seconde
+        self.sync = False
+        self.tempo = 120  # BPM
+        self.division = 4  # pas par temps (doubles croches)
+        self.swing = 0.0  # 0 (régulier) à 0.5
+        self.gate = 0.8  # durée de la note / durée du pas
         self.pattern = 'up'  # up, down, updown
         self.octaves = 1
-        self.base_freq = 440
-        self.current_step = 0
-        self.last_time = 0
         
         # Intervalles pour arpège (en demi-tons)
         self.chord = [0, 4, 7]  # Accord majeur
-    
-    def get_frequency(self, current_time):
-        if not self.enabled:
-            return self.base_freq
         
-        interval = 1.0 / self.speed
-        if current_time - self.last_time >= interval:
-            self.last_time = current_time
-            self.current_step = (self.current_step + 1) % (len(self.chord) * self.octaves)
+        self.held = []  # fréquences des touches tenues, dans l'ordre d'appui
+        self.clock = 0  # échantillons écoulés
+        self.current_step = 0
+        self.next_step = 0.0  # instant du prochain pas (échantillons)
+        self.current = None  # fréquence de la note en cours
+        self.note_off_at = 0.0
+    
+    def press(self, frequency):
+        if not self.held:
+            # Première touche : l'arpège part de l'instant de l'appui
+            self.current_step = 0
+            self.next_step = float(self.clock)
+        if frequency not in self.held:
+            self.held.append(frequency)
+    
+    def release(self, frequency=None):
+        if frequency is None:
+            self.held.clear()
+        elif frequency in self.held:
+            self.held.remove(frequency)
+    
+    def step_duration(self):
+        """Durée du pas courant en échantillons, swing compris"""
+        seconds = 60.0 / (self.tempo * self.division) if self.sync else 1.0 / self.speed
+        swing = self.swing if self.current_step % 2 == 0 else -self.swing
+        return seconds * (1 + swing) * self.sample_rate
+    
+    def step_frequency(self):
+        """Fréquence du pas courant selon le motif"""
+        if len(self.held) > 1:
+            notes = sorted(self.held)
+        else:
+            notes = [self.held[0] * 2 ** (semitones / 12) for semitones in self.chord]
+        sequence = [freq * 2 ** octave for octave in range(self.octaves) for freq in notes]
         
-        # Calculer la note
-        step = self.current_step
+        count = len(sequence)
+        step = self.current_step % count
         if self.pattern == 'down':
-            step = (len(self.chord) * self.octaves - 1) - step
+            step = count - 1 - step
         elif self.pattern == 'updown':
-            total = len(self.chord) * self.octaves * 2 - 2
+            total = max(count * 2 - 2, 1)
             step = self.current_step % total
-            if step >= len(self.chord) * self.octaves:
+            if step >= count:
                 step = total - step
-        
-        octave = step // len(self.chord)
-        note_in_chord = step % len(self.chord)
-        semitones = self.chord[note_in_chord] + octave * 12
-        
-        return self.base_freq * (2 ** (semitones / 12))
+        return sequence[step]
+    
+    def advance(self, num_samples):
+        """Événements (position dans le bloc, 'note_on' ou 'note_off', fréquence) des
+        `num_samples` prochains échantillons ; avance l'horloge d'autant"""
+        events = []
+        end = self.clock + num_samples
+        while True:
+            note_off = self.note_off_at if self.current is not None else math.inf
+            note_on = self.next_step if self.held else math.inf
+            when = min(note_off, note_on)
+            if when == math.inf or math.ceil(when) >= end:
+                break
+            offset = max(math.ceil(when) - self.clock, 0)
+            
+            if note_off <= note_on:
+                events.append((offset, 'note_off', self.current))
+                self.current = None
+            else:
+                if self.current is not None:
+                    # Nouvel appui pendant le gate du pas précédent : il est relâché d'abord
+                    events.append((offset, 'note_off', self.current))
+                duration = self.step_duration()
+                self.current = self.step_frequency()
+                events.append((offset, 'note_on', self.current))
+                self.note_off_at = note_on + self.gate * duration
+                self.next_step = note_on + duration
+                self.current_step += 1
+        
+        self.clock = end
+        return events
+
+
+class EventQueue:
+    """File d'événements horodatés de l'interface (producteur unique) vers le
+    thread audio (consommateur unique).
+    
+    Anneau de cases préallouées : le producteur remplit une case puis avance
+    `write_index`, le consommateur lit jusqu'à `write_index` puis avance
+    `read_index`. Chaque compteur n'est écrit que par un seul thread et une
+    affectation d'entier est atomique : aucun verrou n'est nécessaire.
+    """
+    
+    def __init__(self, capacity=EVENT_QUEUE_SIZE):
+        self.capacity = capacity
+        self.timestamps = [0.0] * capacity
+        self.kinds = [None] * capacity
+        self.targets = [None] * capacity
+        self.values = [None] * capacity
+        self.write_index = 0  # nombre d'événements écrits depuis le début
+        self.read_index = 0  # nombre d'événements lus
+    
+    def push(self, timestamp, kind, target, value):
+        """Ajoute un événement ; retourne False (événement perdu) si la file est pleine"""
+        if self.write_index - self.read_index >= self.capacity:
+            return False
+        slot = self.write_index % self.capacity
+        self.timestamps[slot] = timestamp
+        self.kinds[slot] = kind
+        self.targets[slot] = target
+        self.values[slot] = value
+        self.write_index += 1  # publié seulement une fois la case remplie
+        return True
+    
+    def pop_all(self):
+        """Retire et retourne les événements en attente, dans l'ordre d'arrivée"""
+        end = self.write_index
+        events = []
+        for index in range(self.read_index, end):
+            slot = index % self.capacity
+            events.append((self.timestamps[slot], self.kinds[slot], self.targets[slot],
+                           self.values[slot]))
+        self.read_index = end
+        return events
+
+
+class RenderStats:
+    """Mesures des callbacks audio : charge CPU, blocs en retard et incidents du backend.
+    
+    Écrites par le thread audio seulement, lues par l'interface.
+    """
+    
+    SMOOTHING = 0.1  # lissage de la charge moyenne, par callback
+    PEAK_DECAY = 0.99  # décroissance du pic de charge, par callback
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        self.callbacks = 0
+        self.render_time = 0.0  # calcul du dernier bloc (s)
+        self.load = 0.0  # temps de calcul / durée du bloc, lissé
+        self.peak_load = 0.0
+        self.late_blocks = 0  # blocs calculés en plus de leur propre durée
+        self.underruns = 0  # signalés par le backend
+        self.overruns = 0
+    
+    def record(self, elapsed, num_samples, sample_rate):
+        load = elapsed * sample_rate / num_samples
+        self.callbacks += 1
+        self.render_time = elapsed
+        self.load += self.SMOOTHING * (load - self.load)
+        self.peak_load = max(load, self.peak_load * self.PEAK_DECAY)
+        if load > 1:
+            self.late_blocks += 1
+
+
+# Paramètres réglables par événement : nom -> (composant du Synthesizer, attribut)
+PARAMETERS = {
+    'frequency': (None, 'frequency'),
+    'volume': (None, 'volume'),
+    'waveform': (None, 'waveform'),
+    'waveform2': (None, 'waveform2'),
+    'osc2_enabled': (None, 'osc2_enabled'),
+    'osc2_detune': (None, 'osc2_detune'),
+    'osc2_mix': (None, 'osc2_mix'),
+    'attack': ('envelope', 'attack'),
+    'decay': ('envelope', 'decay'),
+    'sustain': ('envelope', 'sustain'),
+    'release': ('envelope', 'release'),
+    'cutoff': ('filter', 'cutoff'),
+    'resonance': ('filter', 'resonance'),
+    'filter_mode': ('filter', 'mode'),
+    'lfo_rate': ('lfo', 'frequency'),
+    'lfo_depth': ('lfo', 'depth'),
+    'lfo_target': ('lfo', 'target'),
+    'delay_time': ('delay', 'time'),
+    'delay_feedback': ('delay', 'feedback'),
+    'delay_mix': ('delay', 'mix'),
+    'arp_enabled': ('arpeggiator', 'enabled'),
+    'arp_pattern': ('arpeggiator', 'pattern'),
+    'arp_speed': ('arpeggiator', 'speed'),
+    'arp_octaves': ('arpeggiator', 'octaves'),
+    'arp_sync': ('arpeggiator', 'sync'),
+    'arp_tempo': ('arpeggiator', 'tempo'),
+    'arp_swing': ('arpeggiator', 'swing'),
+    'arp_gate': ('arpeggiator', 'gate'),
+}
 
 
 # Presets
@@ -285,14 +740,13 @@ class Synthesizer:
     
     def __init__(self):
         self.sample_rate = SAMPLE_RATE
-        self.oscillator = Oscillator(self.sample_rate)
-        self.oscillator2 = Oscillator(self.sample_rate)
-        self.envelope = ADSREnvelope(self.sample_rate)
+        self.oscillator = Oscillator(self.sample_rate, POLYPHONY)
+        self.oscillator2 = Oscillator(self.sample_rate, POLYPHONY)
+        self.envelope = ADSREnvelope(self.sample_rate, POLYPHONY)
         self.filter = Filter(self.sample_rate)
         self.lfo = LFO(self.sample_rate)
         self.delay = Delay(self.sample_rate)
-        self.arpeggiator = Arpeggiator()
-        self.time = 0.0
+        self.arpeggiator = Arpeggiator(self.sample_rate)
         
         # Paramètres
         self.frequency = 440.0
@@ -303,6 +757,20 @@ class Synthesizer:
         self.osc2_detune = 0  # cents
         self.osc2_mix = 0.5
         
+        # Voix : fréquence, touche enfoncée et ordre de déclenchement
+        self.voice_freq = np.full(POLYPHONY, self.frequency)
+        self.voice_held = np.zeros(POLYPHONY, dtype=bool)
+        self.voice_started = np.zeros(POLYPHONY, dtype=np.int64)
+        self.notes_started = 0
+        
+        # Événements de l'interface, appliqués par le thread audio en début de bloc
+        self.events = EventQueue()
+        self.block_clock = None  # instant (perf_counter) du début du bloc précédent
+        
+        # Taille des blocs audio et mesures de charge
+        self.buffer_size = BUFFER_SIZE
+        self.stats = RenderStats()
+        
         self.playing = False
         self.audio_stream = None
         self.audio_thread = None
@@ -319,7 +787,7 @@ class Synthesizer:
                 channels=CHANNELS,
                 rate=self.sample_rate,
                 output=True,
-                frames_per_buffer=BUFFER_SIZE,
+                frames_per_buffer=self.buffer_size,
                 stream_callback=self._audio_callback_pyaudio
             )
             self.audio_stream.start_stream()
@@ -328,7 +796,7 @@ class Synthesizer:
             self.audio_stream = sd.OutputStream(
                 samplerate=self.sample_rate,
                 channels=CHANNELS,
-                blocksize=BUFFER_SIZE,
+                blocksize=self.buffer_size,
                 callback=self._audio_callback_sounddevice
             )
             self.audio_stream.start()
@@ -345,50 +813,131 @@ class Synthesizer:
             elif AUDIO_BACKEND == 'sounddevice':
                 self.audio_stream.stop()
                 self.audio_stream.close()
+            self.audio_stream = None
+    
+    def set_buffer_size(self, size):
+        """Change la taille des blocs audio ; le flux est rouvert s'il tourne"""
+        restart = self.audio_stream is not None
+        if restart:
+            self.stop()
+        self.buffer_size = size
+        self.block_clock = None
+        self.stats.reset()
+        if restart:
+            self.start()
     
     def _audio_callback_pyaudio(self, in_data, frame_count, time_info, status):
         """Callback pour PyAudio"""
-        samples = self._generate_samples(frame_count)
+        if status & pyaudio.paOutputUnderflow:
+            self.stats.underruns += 1
+        if status & pyaudio.paOutputOverflow:
+            self.stats.overruns += 1
+        samples = self._timed_generate(frame_count)
         return (samples.astype(np.float32).tobytes(), pyaudio.paContinue)
     
     def _audio_callback_sounddevice(self, outdata, frames, time, status):
         """Callback pour sounddevice"""
-        samples = self._generate_samples(frames)
+        if status.output_underflow:
+            self.stats.underruns += 1
+        if status.output_overflow:
+            self.stats.overruns += 1
+        samples = self._timed_generate(frames)
         outdata[:, 0] = samples
     
+    def _timed_generate(self, num_samples):
+        """_generate_samples chronométré pour les mesures de charge"""
+        start = time.perf_counter()
+        samples = self._generate_samples(num_samples)
+        self.stats.record(time.perf_counter() - start, num_samples, self.sample_rate)
+        return samples
+    
     def _generate_samples(self, num_samples):
-        """Génère les échantillons audio"""
-        if not self.playing and self.envelope.state == 'idle':
-            return np.zeros(num_samples)
+        """Génère un bloc audio en appliquant les événements reçus depuis le bloc précédent.
+        
+        Un événement arrivé à une fraction donnée de l'intervalle entre les deux
+        derniers blocs est appliqué à la même fraction du bloc : la latence est
+        fixe (un bloc) au lieu de dépendre de l'instant d'arrivée. Le bloc est
+        calculé par morceaux entre les événements.
+        """
+        now = time.perf_counter()
+        events = self.events.pop_all()
+        if self.block_clock is None:
+            self.block_clock = now
+        
+        output = np.empty(num_samples)
+        start = 0
+        for timestamp, kind, target, value in events:
+            offset = int((timestamp - self.block_clock) * self.sample_rate)
+            offset = min(max(offset, start), num_samples - 1)
+            if offset > start:
+                output[start:offset] = self._play(offset - start)
+                start = offset
+            self._apply_event(kind, target, value)
+        output[start:] = self._play(num_samples - start)
+        self.block_clock = now
+        return output
+    
+    def _play(self, num_samples):
+        """Calcule un morceau de bloc en déclenchant les pas de l'arpégiateur à l'échantillon près"""
+        arp = self.arpeggiator
+        if not arp.enabled:
+            if arp.current is not None:
+                # Arpégiateur coupé : sa note en cours est relâchée
+                self._voice_off(arp.current)
+                arp.current = None
+            arp.release()
+            return self._render(num_samples)
+        
+        events = arp.advance(num_samples)
+        if not events:
+            return self._render(num_samples)
+        output = np.empty(num_samples)
+        start = 0
+        for offset, kind, frequency in events:
+            if offset > start:
+                output[start:offset] = self._render(offset - start)
+                start = offset
+            if kind == 'note_on':
+                self._voice_on(frequency)
+            else:
+                self._voice_off(frequency)
+        output[start:] = self._render(num_samples - start)
+        return output
+    
+    def _render(self, num_samples):
+        """Calcule les échantillons audio : toutes les voix actives en une passe"""
+        voices = self.envelope.active()
+        if not voices.size:
+            if self.delay.mix == 0:
+                return np.zeros(num_samples)
+            # Plus de voix : seuls les échos du delay continuent
+            return np.clip(self.delay.process(np.zeros(num_samples)) * self.volume, -1.0, 1.0)
         
-        self.time += num_samples / self.sample_rate
+        freq = self.voice_freq[voices]
         
-        # Arpégiateur
-        if self.arpeggiator.enabled:
-            freq = self.arpeggiator.get_frequency(self.time)
-        else:
-            freq = self.frequency
-        
-        # LFO pour modulation de fréquence
+        # LFO : facteur par échantillon appliqué à sa cible
+        lfo_target = self.lfo.target if self.lfo.depth else None
         lfo_mod = self.lfo.process(num_samples)
         
-        # Oscillateur 1
-        freq1 = freq * lfo_mod
-        samples = self.oscillator.generate(freq1.mean(), num_samples, self.waveform)
+        # Oscillateur 1 (vibrato : une fréquence par échantillon et par voix)
+        freq1 = freq[:, None] * lfo_mod if lfo_target == 'pitch' else freq
+        samples = self.oscillator.generate(freq1, num_samples, self.waveform, voices)
         
         # Oscillateur 2 (si activé)
         if self.osc2_enabled:
             detune_factor = 2 ** (self.osc2_detune / 1200)  # cents to ratio
-            freq2 = freq * detune_factor * lfo_mod
-            samples2 = self.oscillator2.generate(freq2.mean(), num_samples, self.waveform2)
+            samples2 = self.oscillator2.generate(freq1 * detune_factor, num_samples,
+                                                 self.waveform2, voices)
             samples = samples * (1 - self.osc2_mix) + samples2 * self.osc2_mix
         
-        # Enveloppe ADSR
-        envelope = self.envelope.process(num_samples)
-        samples = samples * envelope
+        # Enveloppes ADSR, puis somme des voix
+        envelope = self.envelope.process(num_samples, voices)
+        samples = np.einsum('vn,vn->n', samples, envelope)
+        if lfo_target == 'amplitude':
+            samples *= lfo_mod
         
         # Filtre
-        samples = self.filter.process(samples)
+        samples = self.filter.process(samples, lfo_mod if lfo_target == 'cutoff' else None)
         
         # Delay
         samples = self.delay.process(samples)
@@ -401,17 +950,125 @@ class Synthesizer:
         
         return samples
     
-    def note_on(self):
-        """Déclenche une note"""
-        self.playing = True
-        self.envelope.note_on()
-        self.oscillator.reset()
-        self.oscillator2.reset()
+    def render(self, events, tail=0.0, block_size=RENDER_BLOCK_SIZE):
+        """Rendu hors ligne, sans périphérique audio : génère les blocs successifs.
+        
+        `events` est une liste de (temps en s, 'note_on' ou 'note_off', fréquence).
+        Les blocs sont coupés aux instants des événements, appliqués à
+        l'échantillon près. Après le dernier événement, les notes tenues sont
+        relâchées et le rendu continue jusqu'au silence des voix, puis `tail`
+        secondes (échos du delay).
+        """
+        position = 0
+        for when, event_type, frequency in sorted(events, key=lambda e: (e[0], e[1] != 'note_off')):
+            at = int(round(when * self.sample_rate))
+            while position < at:
+                count = min(block_size, at - position)
+                yield self._play(count)
+                position += count
+            self._apply_event(event_type, None, frequency)
+        
+        # Les notes encore tenues sont relâchées à la fin de la liste
+        self._release_note(None)
+        while self.envelope.active().size:
+            yield self._play(block_size)
+        remaining = int(tail * self.sample_rate)
+        while remaining > 0:
+            count = min(block_size, remaining)
+            yield self._play(count)
+            remaining -= count
     
-    def note_off(self):
-        """Relâche une note"""
-        self.playing = False
-        self.envelope.note_off()
+    def load_preset(self, preset_name):
+        """Applique un preset au moteur (sans passer par l'interface)"""
+        for name, value in PRESETS[preset_name].items():
+            self.set_param('waveform' if name == 'wave' else name, value)
+    
+    def post(self, kind, value, target=None):
+        """Transmet un événement au thread audio.
+        
+        Sans flux audio ouvert (pas de thread audio, rendu hors ligne),
+        l'événement est appliqué tout de suite.
+        """
+        if self.audio_stream is None:
+            self._apply_event(kind, target, value)
+        else:
+            self.events.push(time.perf_counter(), kind, target, value)
+    
+    def set_param(self, name, value):
+        """Règle un paramètre de PARAMETERS"""
+        self.post('param', value, name)
+    
+    def note_on(self, frequency=None):
+        """Déclenche une note (par défaut à la fréquence courante)"""
+        self.post('note_on', frequency)
+    
+    def note_off(self, frequency=None):
+        """Relâche une note (toutes les notes tenues si la fréquence est omise)"""
+        self.post('note_off', frequency)
+    
+    def _apply_event(self, kind, target, value):
+        if kind == 'note_on':
+            self._start_note(value)
+        elif kind == 'note_off':
+            self._release_note(value)
+        else:
+            component, attribute = PARAMETERS[target]
+            setattr(getattr(self, component) if component else self, attribute, value)
+    
+    def _allocate_voice(self, frequency):
+        """Voix pour une nouvelle note : celle qui joue déjà cette fréquence, sinon une
+        voix libre, sinon la plus faible des voix relâchées, sinon la plus ancienne"""
+        active = self.envelope.state != ADSREnvelope.IDLE
+        same = np.flatnonzero(active & (self.voice_freq == frequency))
+        if same.size:
+            return same[0]
+        free = np.flatnonzero(~active)
+        if free.size:
+            return free[0]
+        released = np.flatnonzero(~self.voice_held)
+        if released.size:
+            return released[np.argmin(self.envelope.level[released])]
+        return int(np.argmin(self.voice_started))
+    
+    def _start_note(self, frequency):
+        """Touche enfoncée (thread audio) : note jouée, ou tenue par l'arpégiateur actif"""
+        if frequency is None:
+            frequency = self.frequency
+        if self.arpeggiator.enabled:
+            self.arpeggiator.press(frequency)
+        else:
+            self._voice_on(frequency)
+    
+    def _release_note(self, frequency):
+        """Touche relâchée (thread audio) ; toutes les touches si la fréquence est omise"""
+        arp = self.arpeggiator
+        arp.release(frequency)
+        # Le pas d'arpège en cours est relâché par l'arpégiateur, à la fin de son gate
+        self._voice_off(frequency, keep=arp.current if arp.enabled else None)
+    
+    def _voice_on(self, frequency):
+        """Déclenche une note sur une voix"""
+        voice = self._allocate_voice(frequency)
+        self.voice_freq[voice] = frequency
+        self.voice_held[voice] = True
+        self.voice_started[voice] = self.notes_started
+        self.notes_started += 1
+        self.playing = True
+        self.envelope.note_on(voice)
+        self.oscillator.reset(voice)
+        self.oscillator2.reset(voice)
+    
+    def _voice_off(self, frequency, keep=None):
+        """Relâche les voix tenues à cette fréquence, ou toutes, sauf celle à `keep`"""
+        held = self.voice_held.copy()
+        if frequency is not None:
+            held &= self.voice_freq == frequency
+        if keep is not None:
+            held &= self.voice_freq != keep
+        for voice in np.flatnonzero(held):
+            self.voice_held[voice] = False
+            self.envelope.note_off(voice)
+        self.playing = bool(self.voice_held.any())
 
 
 class Knob(tk.Canvas):
@@ -613,6 +1270,7 @@ class Piano(tk.Canvas):
         
         self.command = command
         self.pressed_key = None
+        self.pressed_freq = None
         
         # Notes (2 octaves)
         self.white_keys = ['C', 'D', 'E', 'F', 'G', 'A', 'B'] * 2
@@ -702,6 +1360,7 @@ class Piano(tk.Canvas):
                     octave_offset = idx // 7
                 
                 freq = self.note_to_freq(note, octave_offset)
+                self.pressed_freq = freq
                 self.command('note_on', freq)
     
     def on_release(self, event):
@@ -709,7 +1368,7 @@ class Piano(tk.Canvas):
             self.pressed_key = None
             self.draw()
             if self.command:
-                self.command('note_off', 0)
+                self.command('note_off', self.pressed_freq)
     
     def on_motion(self, event):
         key_type, idx = self.get_key_at(event.x, event.y)
@@ -726,6 +1385,9 @@ class Piano(tk.Canvas):
                     octave_offset = idx // 7
                 
                 freq = self.note_to_freq(note, octave_offset)
+                # Glissando : la touche quittée est relâchée
+                self.command('note_off', self.pressed_freq)
+                self.pressed_freq = freq
                 self.command('note_on', freq)
 
 
@@ -738,13 +1400,15 @@ class Visualizer(tk.Canvas):
                         **kwargs)
         
         self.data = np.zeros(100)
+        # Oscillateur propre à l'aperçu : celui du moteur appartient au thread audio
+        self.preview = Oscillator()
     
     def update_data(self, synth):
         """Met à jour avec les données du synthétiseur"""
-        if synth.playing or synth.envelope.state != 'idle':
+        if synth.envelope.active().size:
             # Générer un aperçu de l'onde
-            samples = synth.oscillator.generate(synth.frequency, 100, synth.waveform)
-            self.data = samples * synth.envelope.level * synth.volume
+            samples = self.preview.generate(synth.frequency, 100, synth.waveform)[0]
+            self.data = samples * synth.envelope.level.max() * synth.volume
         else:
             self.data = np.zeros(100)
         
@@ -900,6 +1564,15 @@ class SynthesizerApp:
                                   command=self.on_resonance_change)
         self.resonance_knob.pack(side='left', padx=2)
         
+        filter_modes = tk.Frame(filter_frame, bg=COLORS['panel'])
+        filter_modes.pack(pady=2)
+        
+        self.filter_mode = tk.StringVar(value='lowpass')
+        for mode, label in zip(Filter.MODES, ('LP', 'HP', 'BP')):
+            tk.Radiobutton(filter_modes, text=label, variable=self.filter_mode, value=mode,
+                          bg=COLORS['panel'], fg=COLORS['text'], selectcolor=COLORS['accent'],
+                          font=('Arial', 8), command=self.on_filter_mode_change).pack(side='left')
+        
         # Section LFO
         lfo_frame = tk.LabelFrame(top_row, text="LFO",
                                  bg=COLORS['panel'], fg=COLORS['text'],
@@ -917,6 +1590,15 @@ class SynthesizerApp:
                                   command=self.on_lfo_depth_change)
         self.lfo_depth_knob.pack(side='left', padx=2)
         
+        lfo_targets = tk.Frame(lfo_frame, bg=COLORS['panel'])
+        lfo_targets.pack(pady=2)
+        
+        self.lfo_target = tk.StringVar(value='pitch')
+        for target, label in zip(LFO.TARGETS, ('Pitch', 'Cut', 'Amp')):
+            tk.Radiobutton(lfo_targets, text=label, variable=self.lfo_target, value=target,
+                          bg=COLORS['panel'], fg=COLORS['text'], selectcolor=COLORS['accent'],
+                          font=('Arial', 8), command=self.on_lfo_target_change).pack(side='left')
+        
         # Section Output + Visualiseur
         output_frame = tk.LabelFrame(top_row, text="OUTPUT",
                                     bg=COLORS['panel'], fg=COLORS['text'],
@@ -938,6 +1620,26 @@ class SynthesizerApp:
         self.visualizer = Visualizer(output_frame)
         self.visualizer.pack(padx=5, pady=5)
         
+        # Taille des blocs audio et charge CPU du moteur
+        perf_frame = tk.Frame(output_frame, bg=COLORS['panel'])
+        perf_frame.pack(padx=5, pady=2, fill='x')
+        
+        tk.Label(perf_frame, text="Buffer", bg=COLORS['panel'], fg=COLORS['text'],
+                font=('Arial', 8)).pack(side='left')
+        self.buffer_size = tk.StringVar(value=str(BUFFER_SIZE))
+        buffer_menu = ttk.Combobox(perf_frame, textvariable=self.buffer_size, width=5,
+                                   values=[str(size) for size in BUFFER_SIZES], state='readonly')
+        buffer_menu.pack(side='left', padx=3)
+        buffer_menu.bind('<<ComboboxSelected>>', self.on_buffer_size_change)
+        
+        self.latency_label = tk.Label(perf_frame, bg=COLORS['panel'], fg=COLORS['text'],
+                                     font=('Arial', 8))
+        self.latency_label.pack(side='left')
+        
+        self.cpu_label = tk.Label(output_frame, text="CPU --", bg=COLORS['panel'],
+                                 fg=COLORS['led_on'], font=('Arial', 8), justify='left')
+        self.cpu_label.pack(padx=5, pady=2, anchor='w')
+        
         # ===== RANGÉE 2: DELAY + ARPEGGIATOR + PRESETS =====
         fx_row = tk.Frame(main_frame, bg=COLORS['bg'])
         fx_row.pack(fill='x', pady=5)
@@ -980,6 +1682,12 @@ class SynthesizerApp:
                                         command=self.on_arp_toggle)
         self.arp_check.pack(side='left', padx=5)
         
+        # Synchronisation : la durée des pas suit le tempo (doubles croches) au lieu de Speed
+        self.arp_sync_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(arp_top, text="SYNC", variable=self.arp_sync_var,
+                      bg=COLORS['panel'], fg=COLORS['text'], selectcolor=COLORS['accent'],
+                      font=('Arial', 8), command=self.on_arp_sync_toggle).pack(side='left')
+        
         self.arp_pattern = tk.StringVar(value='up')
         patterns = ['up', 'down', 'updown']
         for p in patterns:
@@ -998,6 +1706,18 @@ class SynthesizerApp:
                                 command=self.on_arp_octaves_change)
         self.arp_oct_knob.pack(side='left', padx=2)
         
+        self.arp_gate_knob = Knob(arp_knobs, "Gate", 0.05, 1, 0.8,
+                                 command=self.on_arp_gate_change)
+        self.arp_gate_knob.pack(side='left', padx=2)
+        
+        self.arp_swing_knob = Knob(arp_knobs, "Swing", 0, 0.5, 0,
+                                  command=self.on_arp_swing_change)
+        self.arp_swing_knob.pack(side='left', padx=2)
+        
+        self.arp_tempo_knob = Knob(arp_knobs, "BPM", 60, 200, 120,
+                                  command=self.on_arp_tempo_change)
+        self.arp_tempo_knob.pack(side='left', padx=2)
+        
         # Presets
         preset_frame = tk.LabelFrame(fx_row, text="PRESETS",
                                     bg=COLORS['panel'], fg=COLORS['text'],
@@ -1035,10 +1755,11 @@ class SynthesizerApp:
         """Dessine la visualisation de l'enveloppe ADSR"""
         self.adsr_viz.delete('all')
         
-        a = self.synth.envelope.attack
-        d = self.synth.envelope.decay
-        s = self.synth.envelope.sustain
-        r = self.synth.envelope.release
+        # Valeurs des boutons : le moteur ne les reçoit qu'au bloc audio suivant
+        a = self.attack_knob.get_value()
+        d = self.decay_knob.get_value()
+        s = self.sustain_knob.get_value()
+        r = self.release_knob.get_value()
         
         total_time = a + d + 0.3 + r  # 0.3 pour le sustain visible
         
@@ -1098,98 +1819,113 @@ class SynthesizerApp:
             self.pressed_keys.add(key)
             note, octave = self.key_map[key]
             freq = self.piano.note_to_freq(note, octave)
-            self.synth.frequency = freq
             self.freq_knob.set_value(freq)
-            self.synth.note_on()
+            self.synth.note_on(freq)
     
     def on_key_release(self, event):
         key = event.char.lower()
         if key in self.pressed_keys:
             self.pressed_keys.discard(key)
-            if not self.pressed_keys:
-                self.synth.note_off()
+            note, octave = self.key_map[key]
+            self.synth.note_off(self.piano.note_to_freq(note, octave))
     
     # Callbacks pour les contrôles
     def on_waveform1_change(self, waveform):
-        self.synth.waveform = waveform
+        self.synth.set_param('waveform', waveform)
     
     def on_waveform2_change(self, waveform):
-        self.synth.waveform2 = waveform
+        self.synth.set_param('waveform2', waveform)
     
     def on_osc2_toggle(self):
-        self.synth.osc2_enabled = self.osc2_var.get()
+        self.synth.set_param('osc2_enabled', self.osc2_var.get())
     
     def on_detune_change(self, value):
-        self.synth.osc2_detune = value
+        self.synth.set_param('osc2_detune', value)
     
     def on_mix_change(self, value):
-        self.synth.osc2_mix = value
+        self.synth.set_param('osc2_mix', value)
     
     def on_attack_change(self, value):
-        self.synth.envelope.attack = value
+        self.synth.set_param('attack', value)
         self.draw_adsr_viz()
     
     def on_decay_change(self, value):
-        self.synth.envelope.decay = value
+        self.synth.set_param('decay', value)
         self.draw_adsr_viz()
     
     def on_sustain_change(self, value):
-        self.synth.envelope.sustain = value
+        self.synth.set_param('sustain', value)
         self.draw_adsr_viz()
     
     def on_release_change(self, value):
-        self.synth.envelope.release = value
+        self.synth.set_param('release', value)
         self.draw_adsr_viz()
     
     def on_cutoff_change(self, value):
-        self.synth.filter.cutoff = value
+        self.synth.set_param('cutoff', value)
     
     def on_resonance_change(self, value):
-        self.synth.filter.resonance = value
+        self.synth.set_param('resonance', value)
+    
+    def on_filter_mode_change(self):
+        self.synth.set_param('filter_mode', self.filter_mode.get())
     
     def on_lfo_rate_change(self, value):
-        self.synth.lfo.frequency = value
+        self.synth.set_param('lfo_rate', value)
     
     def on_lfo_depth_change(self, value):
-        self.synth.lfo.depth = value
+        self.synth.set_param('lfo_depth', value)
+    
+    def on_lfo_target_change(self):
+        self.synth.set_param('lfo_target', self.lfo_target.get())
     
     def on_volume_change(self, value):
-        self.synth.volume = value
+        self.synth.set_param('volume', value)
     
     def on_freq_change(self, value):
-        self.synth.frequency = value
+        self.synth.set_param('frequency', value)
     
     def on_piano_event(self, event_type, freq):
         if event_type == 'note_on':
-            self.synth.frequency = freq
-            self.synth.arpeggiator.base_freq = freq
             self.freq_knob.set_value(freq)
-            self.synth.note_on()
+            self.synth.note_on(freq)
         else:
-            self.synth.note_off()
+            self.synth.note_off(freq)
     
     # Callbacks pour Delay
     def on_delay_time_change(self, value):
-        self.synth.delay.time = value
+        self.synth.set_param('delay_time', value)
     
     def on_delay_feedback_change(self, value):
-        self.synth.delay.feedback = value
+        self.synth.set_param('delay_feedback', value)
     
     def on_delay_mix_change(self, value):
-        self.synth.delay.mix = value
+        self.synth.set_param('delay_mix', value)
     
     # Callbacks pour Arpeggiator
     def on_arp_toggle(self):
-        self.synth.arpeggiator.enabled = self.arp_var.get()
+        self.synth.set_param('arp_enabled', self.arp_var.get())
     
     def on_arp_pattern_change(self):
-        self.synth.arpeggiator.pattern = self.arp_pattern.get()
+        self.synth.set_param('arp_pattern', self.arp_pattern.get())
     
     def on_arp_speed_change(self, value):
-        self.synth.arpeggiator.speed = int(value)
+        self.synth.set_param('arp_speed', int(value))
     
     def on_arp_octaves_change(self, value):
-        self.synth.arpeggiator.octaves = int(value)
+        self.synth.set_param('arp_octaves', int(value))
+    
+    def on_arp_sync_toggle(self):
+        self.synth.set_param('arp_sync', self.arp_sync_var.get())
+    
+    def on_arp_tempo_change(self, value):
+        self.synth.set_param('arp_tempo', value)
+    
+    def on_arp_swing_change(self, value):
+        self.synth.set_param('arp_swing', value)
+    
+    def on_arp_gate_change(self, value):
+        self.synth.set_param('arp_gate', value)
     
     # Presets
     def load_preset(self, preset_name):
@@ -1199,7 +1935,7 @@ class SynthesizerApp:
         waves = ['sine', 'square', 'sawtooth', 'triangle', 'noise']
         self.waveform1.selected = waves.index(p['wave'])
         self.waveform1.draw()
-        self.synth.waveform = p['wave']
+        self.synth.set_param('waveform', p['wave'])
         
         # ADSR
         self.attack_knob.set_value(p['attack'])
@@ -1217,9 +1953,28 @@ class SynthesizerApp:
         
         self.draw_adsr_viz()
     
+    def on_buffer_size_change(self, event=None):
+        self.synth.set_buffer_size(int(self.buffer_size.get()))
+    
+    def update_cpu_meter(self):
+        """Affiche la charge du moteur : moyenne, pic récent et incidents audio"""
+        stats = self.synth.stats
+        self.latency_label.config(
+            text=f"{1000 * self.synth.buffer_size / self.synth.sample_rate:.1f} ms")
+        if not stats.callbacks:
+            self.cpu_label.config(text="CPU --", fg=COLORS['led_on'])
+            return
+        
+        xruns = stats.underruns + stats.overruns
+        self.cpu_label.config(
+            text=f"CPU {stats.load:.0%} (max {stats.peak_load:.0%})\n"
+                 f"xruns {xruns}, blocs en retard {stats.late_blocks}",
+            fg=COLORS['highlight'] if stats.peak_load > 0.8 or xruns else COLORS['led_on'])
+    
     def update_visualizer(self):
-        """Met à jour le visualiseur"""
+        """Met à jour le visualiseur et la charge CPU"""
         self.visualizer.update_data(self.synth)
+        self.update_cpu_meter()
         self.root.after(50, self.update_visualizer)
     
     def on_close(self):
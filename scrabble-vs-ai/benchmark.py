@@ -0,0 +1,283 @@
+"""
+Banc d'essai des performances de l'IA sur des positions fixes
+
+Usage : python benchmark.py                      (compare à la référence enregistrée)
+        python benchmark.py --enregistrer        (remplace la référence)
+        python benchmark.py --generer-positions  (régénère les positions par auto-jeu)
+        python benchmark.py --verifier-elagage   (élagage alpha-beta contre recherche complète)
+
+Les positions (plateau + chevalet) sont dans benchmark_positions.json : plateau
+vide, début de partie, milieu de partie dense et fin de partie avec jokers.
+Chaque opération est chronométrée sur chaque position ; le temps retenu est le
+meilleur de plusieurs répétitions. La comparaison échoue (code de sortie 1) si
+une mesure dépasse la référence de plus de --tolerance. Les temps dépendent de
+la machine : la référence doit être enregistrée sur la machine qui compare.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+from scrabble import (ScrabbleGame, ScrabbleAI, Bag, Board, TileCounts, LeaveTable, LEXICON,
+                      BOARD_SIZE)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+POSITIONS_PATH = os.path.join(HERE, 'benchmark_positions.json')
+BASELINE_PATH = os.path.join(HERE, 'benchmark_baseline.json')
+
+# (nom, graine de la partie d'auto-jeu, coups joués avant la capture, jokers imposés)
+POSITION_SPECS = [
+    ('vide', 0, 0, False),
+    ('debut', 1, 4, False),
+    ('milieu_dense', 3, 16, False),
+    ('fin_jokers', 4, None, True),  # None : dernier coup avant que le sac ne se vide
+]
+
+# Placements (meilleurs coups générés) validés et comptés par position
+PLACEMENTS_PER_POSITION = 50
+
+# Vérification de l'élagage : graines des chevalets adverses, profondeur, coups par nœud
+PRUNING_SEEDS = range(9)
+PRUNING_DEPTH = 3
+PRUNING_MAX_MOVES = 8
+
+
+# ---------- Positions ----------
+
+def capture(name, game, blanks):
+    """Position courante : plateau en lignes de texte ('.' = case vide) et chevalet"""
+    rows = [''.join(game.board.get_cell(row, col) or '.' for col in range(BOARD_SIZE))
+            for row in range(BOARD_SIZE)]
+    rack = game.current_player().rack
+    if blanks and rack.count('*') < 2:
+        # Fin de partie avec jokers : les deux premières tuiles deviennent des jokers
+        rack = sorted(['*', '*'] + [tile for tile in rack if tile != '*'][2:])
+    return {'name': name, 'board': rows, 'rack': ''.join(rack)}
+
+
+def generate_positions():
+    """Joue des parties IA contre IA (gloutonnes) et capture les positions voulues"""
+    positions = []
+    for name, seed, plies, blanks in POSITION_SPECS:
+        game = ScrabbleGame(LEXICON, seed=seed)
+        game.add_player("IA 1", is_ai=True)
+        game.add_player("IA 2", is_ai=True)
+        ais = [ScrabbleAI(game, max_depth=1, leaves=LeaveTable()) for _ in game.players]
+        
+        played = 0
+        while not game.game_over and played != plies:
+            if plies is None and game.bag.remaining() <= 7:
+                break
+            best_move = ais[game.current_player_idx].find_best_move()
+            if best_move and game.play_move(best_move)[0]:
+                played += 1
+                if not game.game_over:
+                    game.next_turn()
+            else:
+                game.pass_turn()
+        positions.append(capture(name, game, blanks))
+    return positions
+
+
+def load_position(position):
+    """Reconstruit (partie, chevalet) à partir d'une position enregistrée"""
+    game = ScrabbleGame(LEXICON, seed=0)
+    game.add_player("Joueur", is_ai=False)
+    game.add_player("IA", is_ai=True)
+    game.current_player_idx = 1
+    
+    tiles = [(row, col, letter)
+             for row, line in enumerate(position['board'])
+             for col, letter in enumerate(line) if letter != '.']
+    game.board = Board(LEXICON)
+    if tiles:
+        game.board.place_tiles(tiles)
+    
+    player = game.current_player()
+    player.tiles = TileCounts(position['rack'])
+    return game, player.tiles.copy()
+
+
+# ---------- Mesures ----------
+
+def measure(func, min_time, repeats):
+    """Meilleur temps par appel (s) sur `repeats` séries d'au moins `min_time` secondes"""
+    func()  # échauffement
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        calls *= 2
+    
+    best = elapsed / calls
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        best = min(best, (time.perf_counter() - start) / calls)
+    return best
+
+
+def run_benchmarks(positions, min_time, repeats):
+    """Retourne {position: {opération: secondes par appel}}"""
+    results = {}
+    for position in positions:
+        game, rack = load_position(position)
+        ai = ScrabbleAI(game, max_depth=1)
+        board = game.board
+        
+        moves = ai.find_all_moves(board, rack)
+        moves.sort(key=lambda m: ai.evaluate_move(*m), reverse=True)
+        placements = [tiles for _, tiles in moves[:PLACEMENTS_PER_POSITION]]
+        
+        def validate():
+            for tiles in placements:
+                game.validate_placement(tiles)
+        
+        def score():
+            for tiles in placements:
+                game.calculate_move_score(tiles)
+        
+        timings = {
+            'find_all_moves': measure(lambda: ai.find_all_moves(board, rack), min_time, repeats),
+            'find_best_move': measure(ai.find_best_move, min_time, repeats),
+        }
+        if placements:
+            # Temps par placement
+            timings['validate_placement'] = measure(validate, min_time, repeats) / len(placements)
+            timings['calculate_move_score'] = measure(score, min_time, repeats) / len(placements)
+        results[position['name']] = timings
+        
+        print(f"{position['name']} ({len(moves)} coups, chevalet {position['rack']})")
+        for operation, seconds in timings.items():
+            print(f"    {operation:22s} {seconds * 1e6:12.1f} µs  {1 / seconds:12.1f} /s")
+    return results
+
+
+# ---------- Vérification de l'élagage ----------
+
+def full_window_value(ai, board, racks, depth, is_maximizing):
+    """Valeur minimax sans élagage, sac vide (référence de ScrabbleAI.minimax)"""
+    if depth == 0:
+        return 0
+    side = 0 if is_maximizing else 1
+    rack = racks[side]
+    moves = ai.find_all_moves(board, rack)
+    moves.sort(key=lambda m: ai.evaluate_move(*m), reverse=True)
+    moves = moves[:ai.max_moves]
+    if not moves:
+        return full_window_value(ai, board, racks, depth - 1, not is_maximizing)
+    
+    values = []
+    for move, tiles in moves:
+        state = board.place_tiles(tiles)
+        new_rack = rack.copy()
+        new_rack.remove(move.letters_used)
+        racks[side] = new_rack
+        value = full_window_value(ai, board, racks, depth - 1, not is_maximizing)
+        racks[side] = rack
+        board.undo(state)
+        eval_score = ai.evaluate_move(move, tiles)
+        values.append(value + eval_score if is_maximizing else value - eval_score)
+    return max(values) if is_maximizing else min(values)
+
+
+def check_pruning(positions):
+    """Compare la recherche alpha-beta à la recherche complète ; retourne les écarts"""
+    mismatches = []
+    print(f"Élagage alpha-beta (profondeur {PRUNING_DEPTH}, {PRUNING_MAX_MOVES} coups par nœud)")
+    for position in positions:
+        for seed in PRUNING_SEEDS:
+            game, rack = load_position(position)
+            ai = ScrabbleAI(game, max_moves=PRUNING_MAX_MOVES)
+            ai.deadline = float('inf')
+            # Chevalet adverse fixé par la graine ; sac vide pour des tirages déterministes
+            unseen = list(ai.unseen_tiles(rack))
+            random.Random(seed).shuffle(unseen)
+            racks = [rack, TileCounts(unseen[:7])]
+            board = game.board.copy()
+            
+            pruned, _ = ai.minimax(board, racks, Bag([]), PRUNING_DEPTH, True,
+                                   float('-inf'), float('inf'))
+            full = full_window_value(ai, board, racks, PRUNING_DEPTH, True)
+            if abs(pruned - full) > 1e-9:
+                mismatches.append((position['name'], seed, pruned, full))
+                print(f"    {position['name']} graine {seed} : {pruned:.2f} au lieu de {full:.2f}")
+    print(f"    {len(mismatches)} écart(s) sur {len(positions) * len(PRUNING_SEEDS)} recherches")
+    return mismatches
+
+
+def compare(results, baseline, tolerance):
+    """Affiche l'écart à la référence et retourne la liste des régressions"""
+    regressions = []
+    print(f"\nComparaison à la référence (tolérance {tolerance:.0%})")
+    for name, timings in results.items():
+        for operation, seconds in timings.items():
+            reference = baseline.get(name, {}).get(operation)
+            if reference is None:
+                print(f"    {name}/{operation} : pas de référence")
+                continue
+            ratio = seconds / reference
+            status = "RÉGRESSION" if ratio > 1 + tolerance else "ok"
+            print(f"    {name + '/' + operation:40s} {ratio:6.2f}x  {status}")
+            if ratio > 1 + tolerance:
+                regressions.append((name, operation, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Banc d'essai des performances de l'IA Scrabble")
+    parser.add_argument('--enregistrer', action='store_true',
+                        help="enregistre les mesures comme nouvelle référence")
+    parser.add_argument('--generer-positions', action='store_true',
+                        help="régénère les positions par auto-jeu")
+    parser.add_argument('--reference', default=BASELINE_PATH, help="fichier de référence")
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help="ralentissement toléré avant d'échouer (0.5 = 50 %%)")
+    parser.add_argument('--duree', type=float, default=0.2,
+                        help="durée minimale d'une série de mesures (s)")
+    parser.add_argument('--repetitions', type=int, default=7, help="séries par mesure")
+    parser.add_argument('--verifier-elagage', action='store_true',
+                        help="vérifie l'élagage alpha-beta contre une recherche complète")
+    args = parser.parse_args()
+    
+    if args.generer_positions or not os.path.exists(POSITIONS_PATH):
+        with open(POSITIONS_PATH, 'w', encoding='utf-8') as f:
+            json.dump(generate_positions(), f, indent=2)
+        print(f"Positions écrites dans {POSITIONS_PATH}")
+    with open(POSITIONS_PATH, encoding='utf-8') as f:
+        positions = json.load(f)
+    
+    if args.verifier_elagage:
+        if check_pruning(positions):
+            sys.exit(1)
+        return
+    
+    results = run_benchmarks(positions, args.duree, args.repetitions)
+    
+    if args.enregistrer:
+        with open(args.reference, 'w', encoding='utf-8') as f:
+            json.dump({'machine': platform.platform(), 'python': platform.python_version(),
+                       'results': results}, f, indent=2)
+        print(f"\nRéférence écrite dans {args.reference}")
+        return
+    
+    if not os.path.exists(args.reference):
+        print(f"\nPas de référence ({args.reference}) : lancer avec --enregistrer")
+        return
+    with open(args.reference, encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+    if compare(results, baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
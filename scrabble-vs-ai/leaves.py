@@ -0,0 +1,137 @@
+"""
+Génération hors ligne de la table des valeurs de reliquat par auto-jeu
+
+Usage : python leaves.py --parties 2000 [--graine 0] [--lexique mots.txt] [--sortie leaves.tsv]
+
+La valeur d'un reliquat est l'écart entre le score moyen du coup suivant du
+joueur qui l'a gardé et le score moyen de tous les coups suivants.
+"""
+
+import argparse
+import time
+from collections import Counter, defaultdict
+
+from scrabble import (ScrabbleGame, ScrabbleAI, LeaveTable, LEXICON, LETTER_DISTRIBUTION,
+                      DEFAULT_LEAVES_PATH, load_lexicon)
+
+TILES = sorted(LETTER_DISTRIBUTION)
+
+
+def play_game(seed, lexicon, samples):
+    """Joue une partie IA contre IA et ajoute à `samples` les couples (reliquat, score suivant)"""
+    game = ScrabbleGame(lexicon, seed=seed)
+    game.add_player("IA 1", is_ai=True)
+    game.add_player("IA 2", is_ai=True)
+    
+    # IA gloutonnes sans table de reliquat, pour ne pas biaiser les mesures
+    ais = [ScrabbleAI(game, max_depth=1, leaves=LeaveTable()) for _ in game.players]
+    pending = [None] * len(game.players)  # reliquat en attente du coup suivant
+    
+    while not game.game_over:
+        idx = game.current_player_idx
+        rack = game.current_player().rack[:]
+        best_move = ais[idx].find_best_move()
+        
+        score = 0
+        success = False
+        if best_move:
+            success, _, score = game.play_move(best_move)
+        
+        if pending[idx] is not None:
+            samples.append((pending[idx], score))
+            pending[idx] = None
+        
+        if not success:
+            game.pass_turn()
+            continue
+        
+        # Les reliquats de fin de partie (sac vide) ne sont pas représentatifs
+        if not game.bag.is_empty():
+            leave = Counter(rack)
+            leave.subtract('*' if letter.islower() else letter for _, _, letter in best_move)
+            pending[idx] = ''.join(sorted(leave.elements()))
+        
+        if not game.game_over:
+            game.next_turn()
+
+
+def fit_tile_values(samples):
+    """Moindres carrés : score suivant ~ biais + somme des valeurs des tuiles gardées"""
+    size = len(TILES) + 1
+    index = {tile: i for i, tile in enumerate(TILES)}
+    # Équations normales (X^T X + ridge) w = X^T y
+    xtx = [[0.0] * size for _ in range(size)]
+    xty = [0.0] * size
+    for leave, score in samples:
+        features = [0.0] * size
+        features[-1] = 1.0
+        for letter in leave:
+            features[index[letter]] += 1.0
+        active = [i for i in range(size) if features[i]]
+        for i in active:
+            xty[i] += features[i] * score
+            for j in active:
+                xtx[i][j] += features[i] * features[j]
+    for i in range(size):
+        xtx[i][i] += 1e-3
+    
+    # Élimination de Gauss avec pivot partiel
+    for col in range(size):
+        pivot = max(range(col, size), key=lambda r: abs(xtx[r][col]))
+        xtx[col], xtx[pivot] = xtx[pivot], xtx[col]
+        xty[col], xty[pivot] = xty[pivot], xty[col]
+        for row in range(col + 1, size):
+            factor = xtx[row][col] / xtx[col][col]
+            for k in range(col, size):
+                xtx[row][k] -= factor * xtx[col][k]
+            xty[row] -= factor * xty[col]
+    weights = [0.0] * size
+    for row in range(size - 1, -1, -1):
+        weights[row] = (xty[row] - sum(xtx[row][k] * weights[k]
+                                       for k in range(row + 1, size))) / xtx[row][row]
+    
+    return dict(zip(TILES, weights[:-1])), weights[-1]
+
+
+def build_table(samples, min_count):
+    """Construit la table à partir des échantillons d'auto-jeu"""
+    mean_all = sum(score for _, score in samples) / len(samples)
+    
+    totals = defaultdict(float)
+    counts = Counter()
+    for leave, score in samples:
+        totals[leave] += score
+        counts[leave] += 1
+    values = {leave: totals[leave] / count - mean_all
+              for leave, count in counts.items() if count >= min_count}
+    
+    tile_values, intercept = fit_tile_values(samples)
+    return LeaveTable(values, tile_values, intercept - mean_all)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère la table des valeurs de reliquat")
+    parser.add_argument('--parties', type=int, default=1000, help="nombre de parties d'auto-jeu")
+    parser.add_argument('--graine', type=int, default=0, help="graine de la première partie")
+    parser.add_argument('--min-occurrences', type=int, default=10,
+                        help="occurrences minimales pour garder un reliquat exact")
+    parser.add_argument('--lexique', metavar='FICHIER', help="liste de mots à utiliser")
+    parser.add_argument('--sortie', default=DEFAULT_LEAVES_PATH, help="fichier de table à écrire")
+    args = parser.parse_args()
+    
+    lexicon = load_lexicon(args.lexique) if args.lexique else LEXICON
+    samples = []
+    start = time.perf_counter()
+    for i in range(args.parties):
+        play_game(args.graine + i, lexicon, samples)
+        if (i + 1) % 100 == 0:
+            print(f"{i + 1} parties, {len(samples)} reliquats ({time.perf_counter() - start:.0f} s)")
+    
+    table = build_table(samples, args.min_occurrences)
+    table.save(args.sortie, header=f"Valeurs de reliquat : {args.parties} parties d'auto-jeu, "
+                                   f"graine {args.graine}, {len(samples)} reliquats")
+    print(f"{len(table.values)} reliquats écrits dans {args.sortie}")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,9 +3,19 @@ Scrabble avec interface Tkinter et IA Minimax
 """
 
 import tkinter as tk
-from tkinter import messagebox, simpledialog
+from tkinter import ttk, messagebox, simpledialog
 import random
-from collections import Counter
+import time
+import os
+import queue
+import threading
+from collections import OrderedDict
+from array import array
+import mmap
+import struct
+import sys
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 import copy
 
 # ==================== CONSTANTES ====================
@@ -40,6 +50,58 @@ DOUBLE_LETTER = [(0,3), (0,11), (2,6), (2,8), (3,0), (3,7), (3,14),
                  (8,2), (8,6), (8,8), (8,12), (11,0), (11,7), (11,14),
                  (12,6), (12,8), (14,3), (14,11)]
 
+BOARD_CELLS = BOARD_SIZE * BOARD_SIZE
+
+
+def _build_multiplier_table():
+    """Précalcule le multiplicateur de chaque case (index row * BOARD_SIZE + col)"""
+    table = [('none', 1)] * BOARD_CELLS
+    for squares, multiplier in ((DOUBLE_LETTER, ('letter', 2)), (TRIPLE_LETTER, ('letter', 3)),
+                                (DOUBLE_WORD, ('word', 2)), (TRIPLE_WORD, ('word', 3))):
+        for row, col in squares:
+            table[row * BOARD_SIZE + col] = multiplier
+    return table
+
+
+MULTIPLIERS = _build_multiplier_table()
+# Multiplicateurs séparés pour les boucles de score de l'IA
+LETTER_MULTIPLIERS = bytes(m[1] if m[0] == 'letter' else 1 for m in MULTIPLIERS)
+WORD_MULTIPLIERS = bytes(m[1] if m[0] == 'word' else 1 for m in MULTIPLIERS)
+
+# Clés de Zobrist : une valeur 64 bits par (case, code de lettre), indexée par
+# (index << 7) | code. Graine fixe pour des empreintes identiques entre processus.
+_zobrist_rng = random.Random(0x5C4A)
+ZOBRIST_KEYS = [_zobrist_rng.getrandbits(64) for _ in range(BOARD_CELLS << 7)]
+del _zobrist_rng
+
+# Nombre de nœuds de recherche (plateau, chevalet) dont les coups sont gardés en cache
+SEARCH_CACHE_SIZE = 4096
+
+# Intervalle de rafraîchissement de la progression de l'IA (ms)
+AI_POLL_MS = 100
+# Durée d'une tranche de simulation confiée à un processus (s)
+SIM_SLICE = 0.25
+
+# Niveaux de difficulté de l'IA : tuiles posées au plus par coup, coups explorés
+# par nœud interne, profondeur maximale de l'approfondissement itératif, budget
+# ferme de réflexion par tour (ms) et simulation Monte-Carlo (candidats simulés,
+# demi-coups joués après chacun ; 0 candidat : pas de simulation).
+# Chaque niveau bat celui du dessous en auto-jeu. Avec un seul chevalet adverse
+# tiré au hasard, le minimax à profondeur 2 ou plus joue moins bien que le coup
+# glouton : la force vient des tuiles posées, puis de la simulation, qui moyenne
+# sur de nombreux chevalets adverses.
+DIFFICULTY_LEVELS = {
+    'facile': {'max_tiles': 2, 'max_moves': 5, 'max_depth': 1, 'budget_ms': 300,
+               'sim_candidates': 0, 'sim_plies': 1},
+    'normal': {'max_tiles': 7, 'max_moves': 10, 'max_depth': 1, 'budget_ms': 300,
+               'sim_candidates': 0, 'sim_plies': 1},
+    'difficile': {'max_tiles': 7, 'max_moves': 10, 'max_depth': 1, 'budget_ms': 300,
+                  'sim_candidates': 2, 'sim_plies': 1},
+    'expert': {'max_tiles': 7, 'max_moves': 10, 'max_depth': 1, 'budget_ms': 500,
+               'sim_candidates': 10, 'sim_plies': 1},
+}
+DEFAULT_DIFFICULTY = 'normal'
+
 # Couleurs
 COLORS = {
     'board': '#C4A484',
@@ -114,28 +176,410 @@ DICTIONARY = {
 }
 
 
+# ==================== DICTIONNAIRE (DAWG) ====================
+
+ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+LETTER_INDEX = {letter: i for i, letter in enumerate(ALPHABET)}
+ALL_LETTERS_MASK = (1 << len(ALPHABET)) - 1
+
+# Encodage d'une arête sur 32 bits :
+# bits 0-4 = lettre, bit 5 = dernière arête du nœud, bit 6 = fin de mot,
+# bits 7-31 = index de la première arête du nœud fils (0 = pas de fils)
+EDGE_LETTER_MASK = 0x1F
+EDGE_LAST = 1 << 5
+EDGE_TERMINAL = 1 << 6
+EDGE_CHILD_SHIFT = 7
+
+# Format du fichier de lexique compilé : magique + nombre d'arêtes + arêtes
+DAWG_MAGIC = b'DAWG1\n'
+DAWG_HEADER_SIZE = len(DAWG_MAGIC) + 4
+
+
+class _DawgNode:
+    """Nœud temporaire utilisé pendant la construction du DAWG"""
+    __slots__ = ('children', 'terminal')
+    
+    def __init__(self):
+        self.children = {}
+        self.terminal = False
+    
+    def signature(self):
+        return (self.terminal,
+                tuple((letter, id(child)) for letter, child in sorted(self.children.items())))
+
+
+class Dawg:
+    """Automate minimal (DAWG) du dictionnaire, stocké dans un tableau d'arêtes compact.
+    
+    Un nœud est désigné par l'index de sa première arête ; le nœud 0 n'a pas de fils.
+    """
+    
+    def __init__(self, edges, path=None):
+        self.edges = edges
+        self.root = 1 if len(edges) > 1 else 0
+        self.path = path  # fichier compilé projeté en mémoire, le cas échéant
+    
+    @classmethod
+    def from_words(cls, words):
+        """Compile un ensemble de mots"""
+        return cls(cls._build(normalize_word(word) for word in words))
+    
+    @classmethod
+    def from_word_file(cls, path):
+        """Compile une liste de mots en texte brut (un mot par ligne)"""
+        with open(path, encoding='utf-8') as f:
+            return cls.from_words(line.split()[0] for line in f if line.strip())
+    
+    def save(self, path):
+        """Écrit l'automate compilé (en-tête + arêtes en uint32 little-endian)"""
+        edges = array('I', self.edges)
+        if sys.byteorder != 'little':
+            edges.byteswap()
+        with open(path, 'wb') as f:
+            f.write(DAWG_MAGIC + struct.pack('<I', len(edges)))
+            edges.tofile(f)
+    
+    @classmethod
+    def load(cls, path):
+        """Projette en mémoire (mmap) un automate écrit par save()"""
+        with open(path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if data[:len(DAWG_MAGIC)] != DAWG_MAGIC:
+            data.close()
+            raise ValueError(f"{path} n'est pas un lexique compilé")
+        count, = struct.unpack_from('<I', data, len(DAWG_MAGIC))
+        if sys.byteorder == 'little':
+            # Les arêtes sont lues directement dans le fichier, sans copie
+            edges = memoryview(data)[DAWG_HEADER_SIZE:DAWG_HEADER_SIZE + 4 * count].cast('I')
+        else:
+            edges = array('I', data[DAWG_HEADER_SIZE:DAWG_HEADER_SIZE + 4 * count])
+            edges.byteswap()
+        return cls(edges, path)
+    
+    def __getstate__(self):
+        # Un lexique projeté en mémoire est rouvert par chemin dans les autres processus
+        if self.path is not None:
+            return {'path': self.path}
+        return {'edges': self.edges}
+    
+    def __setstate__(self, state):
+        if 'path' in state:
+            self.__dict__.update(Dawg.load(state['path']).__dict__)
+        else:
+            self.__init__(state['edges'])
+    
+    @staticmethod
+    def _build(words):
+        """Construit le DAWG par l'algorithme incrémental de Daciuk (mots triés)"""
+        root = _DawgNode()
+        register = {}
+        unchecked = []  # [(parent, lettre, fils), ...] du dernier mot inséré
+        previous = ""
+        
+        def minimize(down_to):
+            while len(unchecked) > down_to:
+                parent, letter, child = unchecked.pop()
+                key = child.signature()
+                if key in register:
+                    parent.children[letter] = register[key]
+                else:
+                    register[key] = child
+        
+        for word in sorted(set(words)):
+            if len(word) < 2 or any(letter not in LETTER_INDEX for letter in word):
+                continue
+            common = 0
+            while common < min(len(word), len(previous)) and word[common] == previous[common]:
+                common += 1
+            minimize(common)
+            
+            node = unchecked[-1][2] if unchecked else root
+            for letter in word[common:]:
+                child = _DawgNode()
+                node.children[letter] = child
+                unchecked.append((node, letter, child))
+                node = child
+            node.terminal = True
+            previous = word
+        minimize(0)
+        
+        # Sérialisation : chaque nœud interne reçoit un bloc d'arêtes contigu
+        edges = array('I', [0])  # l'index 0 est réservé
+        if not root.children:
+            return edges
+        offsets = {id(root): 1}
+        order = [root]
+        next_offset = 1 + len(root.children)
+        i = 0
+        while i < len(order):
+            for _, child in sorted(order[i].children.items()):
+                if child.children and id(child) not in offsets:
+                    offsets[id(child)] = next_offset
+                    next_offset += len(child.children)
+                    order.append(child)
+            i += 1
+        
+        for node in order:
+            items = sorted(node.children.items())
+            for j, (letter, child) in enumerate(items):
+                edge = LETTER_INDEX[letter] | (offsets.get(id(child), 0) << EDGE_CHILD_SHIFT)
+                if j == len(items) - 1:
+                    edge |= EDGE_LAST
+                if child.terminal:
+                    edge |= EDGE_TERMINAL
+                edges.append(edge)
+        return edges
+    
+    def find_edge(self, node, letter):
+        """Retourne l'arête sortant de `node` pour `letter` (0 si absente)"""
+        index = LETTER_INDEX.get(letter.upper())
+        if index is None:
+            return 0
+        edges = self.edges
+        i = node
+        while i:
+            edge = edges[i]
+            if edge & EDGE_LETTER_MASK == index:
+                return edge
+            i = 0 if edge & EDGE_LAST else i + 1
+        return 0
+    
+    def follow(self, node, letters):
+        """Suit une suite de lettres ; retourne (nœud, fin_de_mot) ou None"""
+        terminal = False
+        for letter in letters:
+            edge = self.find_edge(node, letter)
+            if not edge:
+                return None
+            node = edge >> EDGE_CHILD_SHIFT
+            terminal = bool(edge & EDGE_TERMINAL)
+        return node, terminal
+    
+    def __contains__(self, word):
+        state = self.follow(self.root, word)
+        return state is not None and state[1]
+    
+    def cross_check_mask(self, before, after):
+        """Masque des lettres L telles que before + L + after soit un mot"""
+        state = self.follow(self.root, before)
+        if state is None:
+            return 0
+        mask = 0
+        edges = self.edges
+        i = state[0]
+        while i:
+            edge = edges[i]
+            i = 0 if edge & EDGE_LAST else i + 1
+            if not after:
+                if edge & EDGE_TERMINAL:
+                    mask |= 1 << (edge & EDGE_LETTER_MASK)
+                continue
+            end = self.follow(edge >> EDGE_CHILD_SHIFT, after)
+            if end is not None and end[1]:
+                mask |= 1 << (edge & EDGE_LETTER_MASK)
+        return mask
+
+
+def normalize_word(word):
+    """Met un mot en majuscules sans accents ni ligatures (é -> E, œ -> OE)"""
+    word = word.strip().upper().replace('Œ', 'OE').replace('Æ', 'AE')
+    return ''.join(c for c in unicodedata.normalize('NFD', word) if not unicodedata.combining(c))
+
+
+def load_lexicon(word_file):
+    """Charge une liste de mots, compilée une fois dans un fichier .dawg voisin.
+    
+    Les lancements suivants projettent directement le fichier compilé en mémoire,
+    tant qu'il est plus récent que la liste de mots.
+    """
+    compiled = word_file + '.dawg'
+    if not os.path.exists(compiled) or os.path.getmtime(compiled) < os.path.getmtime(word_file):
+        Dawg.from_word_file(word_file).save(compiled)
+    return Dawg.load(compiled)
+
+
+# Dictionnaire intégré, construit une seule fois au démarrage
+LEXICON = Dawg.from_words(DICTIONARY)
+
+
+# ==================== VALEURS DE RELIQUAT ====================
+
+class LeaveTable:
+    """Valeur (en points) des lettres gardées sur le chevalet après un coup.
+    
+    Les reliquats sont indexés par leurs lettres triées ('*' pour un joker).
+    Un reliquat absent de la table est estimé par la somme des valeurs de ses
+    tuiles plus un biais (modèle linéaire ajusté sur les mêmes parties).
+    """
+    
+    def __init__(self, values=None, tile_values=None, bias=0.0):
+        self.values = values or {}
+        self.tile_values = tile_values or {}
+        self.bias = bias
+    
+    def value(self, leave):
+        """Valeur d'un reliquat trié"""
+        value = self.values.get(leave)
+        if value is not None:
+            return value
+        if not self.tile_values:
+            return 0.0
+        tile_values = self.tile_values
+        return self.bias + sum(tile_values.get(letter, 0.0) for letter in leave)
+    
+    @classmethod
+    def load(cls, path):
+        """Lit une table écrite par save()"""
+        table = cls()
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip() or line.startswith('#'):
+                    continue
+                key, value = line.rstrip('\n').split('\t')
+                if key == LEAVE_BIAS_KEY:
+                    table.bias = float(value)
+                elif key.startswith(LEAVE_TILE_PREFIX):
+                    table.tile_values[key[1:]] = float(value)
+                else:
+                    table.values[key] = float(value)
+        return table
+    
+    def save(self, path, header=""):
+        """Écrit la table (une ligne reliquat<TAB>valeur)"""
+        with open(path, 'w', encoding='utf-8') as f:
+            if header:
+                f.write(f"# {header}\n")
+            f.write(f"{LEAVE_BIAS_KEY}\t{self.bias:.2f}\n")
+            for letter, value in sorted(self.tile_values.items()):
+                f.write(f"{LEAVE_TILE_PREFIX}{letter}\t{value:.2f}\n")
+            for leave, value in sorted(self.values.items(), key=lambda kv: (len(kv[0]), kv[0])):
+                f.write(f"{leave}\t{value:.2f}\n")
+
+
+LEAVE_BIAS_KEY = '@biais'
+LEAVE_TILE_PREFIX = '@'
+# Table générée hors ligne par leaves.py (dictionnaire intégré)
+DEFAULT_LEAVES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'leaves.tsv')
+LEAVES = LeaveTable.load(DEFAULT_LEAVES_PATH) if os.path.exists(DEFAULT_LEAVES_PATH) else LeaveTable()
+
+
 # ==================== CLASSES ====================
 
+# Emplacements des compteurs de tuiles : A-Z puis le joker
+BLANK = '*'
+BLANK_SLOT = len(ALPHABET)
+TILE_SLOTS = ALPHABET + BLANK
+TILE_INDEX = {tile: i for i, tile in enumerate(TILE_SLOTS)}
+
+
+class TileCounts:
+    """Multiensemble de tuiles : un compteur par lettre et un pour le joker.
+    
+    Ajouts, retraits et tests d'appartenance coûtent O(1) par tuile sur un
+    tableau fixe de 27 entiers, au lieu de parcourir une liste.
+    """
+    __slots__ = ('counts', 'total')
+    
+    def __init__(self, tiles=()):
+        self.counts = [0] * len(TILE_SLOTS)
+        self.total = 0
+        self.add(tiles)
+    
+    def add(self, tiles):
+        counts = self.counts
+        for tile in tiles:
+            counts[TILE_INDEX[tile]] += 1
+            self.total += 1
+    
+    def remove(self, tiles):
+        """Retire les tuiles présentes (les absentes sont ignorées)"""
+        counts = self.counts
+        for tile in tiles:
+            slot = TILE_INDEX[tile]
+            if counts[slot]:
+                counts[slot] -= 1
+                self.total -= 1
+    
+    def contains(self, tiles):
+        """Vrai si toutes les tuiles (avec répétitions) sont présentes"""
+        needed = [0] * len(TILE_SLOTS)
+        counts = self.counts
+        for tile in tiles:
+            slot = TILE_INDEX[tile]
+            needed[slot] += 1
+            if needed[slot] > counts[slot]:
+                return False
+        return True
+    
+    def draw(self, count, rng=random):
+        """Retire `count` tuiles au hasard (proportionnellement aux compteurs)"""
+        counts = self.counts
+        drawn = []
+        for _ in range(min(count, self.total)):
+            pick = rng.randrange(self.total)
+            slot = 0
+            while pick >= counts[slot]:
+                pick -= counts[slot]
+                slot += 1
+            counts[slot] -= 1
+            self.total -= 1
+            drawn.append(TILE_SLOTS[slot])
+        return drawn
+    
+    def copy(self):
+        new = TileCounts()
+        new.counts = self.counts[:]
+        new.total = self.total
+        return new
+    
+    def elements(self):
+        """Tuiles dans l'ordre de sorted() (joker en tête)"""
+        counts = self.counts
+        tiles = [BLANK] * counts[BLANK_SLOT]
+        for slot in range(BLANK_SLOT):
+            if counts[slot]:
+                tiles.extend(ALPHABET[slot] * counts[slot])
+        return tiles
+    
+    def key(self):
+        """Chaîne triée des tuiles (clé de la table des reliquats)"""
+        return ''.join(self.elements())
+    
+    def __contains__(self, tile):
+        return self.counts[TILE_INDEX[tile]] > 0
+    
+    def __getitem__(self, tile):
+        return self.counts[TILE_INDEX[tile]]
+    
+    def __iter__(self):
+        return iter(self.elements())
+    
+    def __len__(self):
+        return self.total
+
+
 class Bag:
-    """Sac de lettres"""
-    def __init__(self):
-        self.letters = []
-        for letter, count in LETTER_DISTRIBUTION.items():
-            self.letters.extend([letter] * count)
-        random.shuffle(self.letters)
+    """Sac de lettres, tiré au hasard avec `rng` (reproductible s'il est initialisé)"""
+    def __init__(self, letters=None, rng=None):
+        if letters is None:
+            letters = [letter for letter, count in LETTER_DISTRIBUTION.items()
+                       for _ in range(count)]
+        self.tiles = TileCounts(letters)
+        self.rng = rng or random
     
     def draw(self, count):
         """Piocher des lettres"""
-        drawn = []
-        for _ in range(min(count, len(self.letters))):
-            drawn.append(self.letters.pop())
-        return drawn
+        return self.tiles.draw(count, self.rng)
+    
+    def put_back(self, letters):
+        """Remet des lettres dans le sac (échange, ou annulation d'un draw())"""
+        self.tiles.add(letters)
     
     def remaining(self):
-        return len(self.letters)
+        return self.tiles.total
     
     def is_empty(self):
-        return len(self.letters) == 0
+        return self.tiles.total == 0
 
 
 class Player:
@@ -143,56 +587,191 @@ class Player:
     def __init__(self, name, is_ai=False):
         self.name = name
         self.is_ai = is_ai
-        self.rack = []
+        self.tiles = TileCounts()
         self.score = 0
     
+    @property
+    def rack(self):
+        """Lettres du chevalet, triées (liste recalculée à chaque accès)"""
+        return self.tiles.elements()
+    
     def add_letters(self, letters):
-        self.rack.extend(letters)
+        self.tiles.add(letters)
     
     def remove_letters(self, letters):
-        for letter in letters:
-            if letter in self.rack:
-                self.rack.remove(letter)
+        self.tiles.remove(letters)
     
     def rack_string(self):
-        return ''.join(sorted(self.rack))
+        return self.tiles.key()
 
 
 class Board:
-    """Plateau de jeu"""
-    def __init__(self):
-        self.grid = [[None for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
+    """Plateau de jeu.
+    
+    Les 225 cases sont stockées à plat dans un bytearray (0 = case vide,
+    sinon code de la lettre) indexé par row * BOARD_SIZE + col.
+    """
+    def __init__(self, lexicon=LEXICON):
+        self.cells = bytearray(BOARD_CELLS)
         self.first_move = True
+        self.lexicon = lexicon
+        
+        # Contre-vérifications par direction de jeu (True = coup horizontal) :
+        # masque 26 bits des lettres autorisées et score du mot perpendiculaire
+        # existant (None si la case n'a pas de voisin perpendiculaire)
+        self.cross_checks = {True: [ALL_LETTERS_MASK] * BOARD_CELLS,
+                             False: [ALL_LETTERS_MASK] * BOARD_CELLS}
+        self.cross_scores = {True: [None] * BOARD_CELLS, False: [None] * BOARD_CELLS}
+        
+        # Cases d'ancrage : cases vides adjacentes à au moins une lettre posée,
+        # tenues à jour par place_tiles() et undo()
+        self.anchors = set()
+        
+        # Empreinte de Zobrist du contenu des cases (0 pour le plateau vide)
+        self.hash = 0
     
     def get_cell(self, row, col):
         if 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE:
-            return self.grid[row][col]
+            code = self.cells[row * BOARD_SIZE + col]
+            return chr(code) if code else None
         return None
     
     def set_cell(self, row, col, letter):
+        """Modifie une case sans mettre à jour les contre-vérifications (voir place_tiles)"""
         if 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE:
-            self.grid[row][col] = letter
+            index = row * BOARD_SIZE + col
+            if self.cells[index]:
+                self.hash ^= ZOBRIST_KEYS[index << 7 | self.cells[index]]
+            self.cells[index] = ord(letter) if letter else 0
+            if letter:
+                self.hash ^= ZOBRIST_KEYS[index << 7 | self.cells[index]]
     
     def is_empty(self, row, col):
         return self.get_cell(row, col) is None
     
+    def place_tiles(self, tiles):
+        """Pose des tuiles et met à jour les contre-vérifications autour d'elles.
+        
+        Retourne un état d'annulation à passer à undo().
+        """
+        first_move = self.first_move
+        for row, col, letter in tiles:
+            self.set_cell(row, col, letter)
+        self.first_move = False
+        
+        # Les cases couvertes ne sont plus des ancres, leurs voisines vides le deviennent
+        covered = {(row, col) for row, col, _ in tiles}
+        removed_anchors = covered & self.anchors
+        self.anchors -= removed_anchors
+        added_anchors = set()
+        for row, col, _ in tiles:
+            for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                square = (row + dr, col + dc)
+                if (square not in self.anchors and square not in covered
+                        and 0 <= square[0] < BOARD_SIZE and 0 <= square[1] < BOARD_SIZE
+                        and self.cells[square[0] * BOARD_SIZE + square[1]] == 0):
+                    added_anchors.add(square)
+        self.anchors |= added_anchors
+        
+        # Seules les cases vides au bout des lignes et colonnes touchées changent
+        to_refresh = set()
+        for row, col, _ in tiles:
+            for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                r, c = row + dr, col + dc
+                while self.get_cell(r, c) is not None:
+                    r, c = r + dr, c + dc
+                if 0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE:
+                    to_refresh.add(r * BOARD_SIZE + c)
+        
+        saved = []
+        for index in to_refresh:
+            saved.append((index,
+                          self.cross_checks[True][index], self.cross_checks[False][index],
+                          self.cross_scores[True][index], self.cross_scores[False][index]))
+            self._refresh_cross_check(index)
+        
+        return tiles, saved, first_move, removed_anchors, added_anchors
+    
+    def undo(self, state):
+        """Annule un place_tiles()"""
+        tiles, saved, first_move, removed_anchors, added_anchors = state
+        self.anchors -= added_anchors
+        self.anchors |= removed_anchors
+        for row, col, letter in tiles:
+            self.cells[row * BOARD_SIZE + col] = 0
+            self.hash ^= ZOBRIST_KEYS[(row * BOARD_SIZE + col) << 7 | ord(letter)]
+        for index, check_h, check_v, score_h, score_v in saved:
+            self.cross_checks[True][index] = check_h
+            self.cross_checks[False][index] = check_v
+            self.cross_scores[True][index] = score_h
+            self.cross_scores[False][index] = score_v
+        self.first_move = first_move
+    
+    def _refresh_cross_check(self, index):
+        row, col = divmod(index, BOARD_SIZE)
+        for horizontal in (True, False):
+            # Un coup horizontal forme des mots croisés verticaux, et inversement
+            dr, dc = (1, 0) if horizontal else (0, 1)
+            before = ""
+            r, c = row - dr, col - dc
+            while self.get_cell(r, c) is not None:
+                before = self.get_cell(r, c) + before
+                r, c = r - dr, c - dc
+            after = ""
+            r, c = row + dr, col + dc
+            while self.get_cell(r, c) is not None:
+                after += self.get_cell(r, c)
+                r, c = r + dr, c + dc
+            
+            if before or after:
+                mask = self.lexicon.cross_check_mask(before, after)
+                score = sum(0 if letter.islower() else LETTER_VALUES[letter]
+                            for letter in before + after)
+            else:
+                mask, score = ALL_LETTERS_MASK, None
+            self.cross_checks[horizontal][index] = mask
+            self.cross_scores[horizontal][index] = score
+    
+    def compute_hash(self):
+        """Recalcule l'empreinte de Zobrist à partir des cases"""
+        value = 0
+        for index, code in enumerate(self.cells):
+            if code:
+                value ^= ZOBRIST_KEYS[index << 7 | code]
+        return value
+    
     def get_multiplier(self, row, col):
         """Retourne le multiplicateur de la case"""
-        if (row, col) in TRIPLE_WORD:
-            return ('word', 3)
-        elif (row, col) in DOUBLE_WORD:
-            return ('word', 2)
-        elif (row, col) in TRIPLE_LETTER:
-            return ('letter', 3)
-        elif (row, col) in DOUBLE_LETTER:
-            return ('letter', 2)
-        return ('none', 1)
+        return MULTIPLIERS[row * BOARD_SIZE + col]
+    
+    def snapshot(self):
+        """État sérialisable du plateau (sans le lexique) pour les processus de calcul"""
+        return (bytes(self.cells), self.first_move,
+                self.cross_checks[True], self.cross_checks[False],
+                self.cross_scores[True], self.cross_scores[False], self.anchors)
+    
+    @classmethod
+    def from_snapshot(cls, state, lexicon=LEXICON):
+        """Reconstruit un plateau à partir de snapshot()"""
+        board = cls(lexicon)
+        cells, board.first_move, check_h, check_v, score_h, score_v, anchors = state
+        board.cells[:] = cells
+        board.anchors = set(anchors)
+        board.hash = board.compute_hash()
+        board.cross_checks = {True: list(check_h), False: list(check_v)}
+        board.cross_scores = {True: list(score_h), False: list(score_v)}
+        return board
     
     def copy(self):
         """Copie profonde du plateau"""
-        new_board = Board()
-        new_board.grid = [row[:] for row in self.grid]
+        new_board = Board(self.lexicon)
+        new_board.cells[:] = self.cells
         new_board.first_move = self.first_move
+        new_board.anchors = set(self.anchors)
+        new_board.hash = self.hash
+        for horizontal in (True, False):
+            new_board.cross_checks[horizontal] = self.cross_checks[horizontal][:]
+            new_board.cross_scores[horizontal] = self.cross_scores[horizontal][:]
         return new_board
 
 
@@ -205,13 +784,47 @@ class Move:
         self.horizontal = horizontal
         self.letters_used = letters_used  # Lettres du chevalet utilisées
         self.score = 0
+        self.leave = None  # Lettres restant sur le chevalet, triées
+
+
+class SearchCache:
+    """Cache LRU des coups des nœuds de recherche, indexé par l'empreinte du plateau"""
+    def __init__(self, maxsize=SEARCH_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+    
+    def put(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+    
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+    
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = 0
 
 
 class ScrabbleGame:
     """Logique du jeu"""
-    def __init__(self):
-        self.board = Board()
-        self.bag = Bag()
+    def __init__(self, lexicon=LEXICON, seed=None):
+        self.lexicon = lexicon
+        self.board = Board(lexicon)
+        self.bag = Bag(rng=random.Random(seed) if seed is not None else None)
         self.players = []
         self.current_player_idx = 0
         self.consecutive_passes = 0
@@ -239,7 +852,8 @@ class ScrabbleGame:
             else:
                 row, col = start_row + i, start_col
             
-            letter_score = LETTER_VALUES.get(letter.upper(), 0)
+            # Un joker (lettre minuscule) ne rapporte aucun point
+            letter_score = 0 if letter.islower() else LETTER_VALUES.get(letter, 0)
             
             # Appliquer les bonus seulement pour les nouvelles tuiles
             if (row, col) in new_tiles_positions:
@@ -301,8 +915,25 @@ class ScrabbleGame:
         
         return words
     
+    def analyze_placement(self, tiles_placed):
+        """Analyse un placement : (valide, message, mots formés, mots invalides, score).
+        
+        Les mots formés ne sont construits qu'une fois pour la validation et le
+        score. La recherche de l'IA n'appelle pas cette méthode : ses coups sont
+        notés par le générateur et mis en cache par ScrabbleAI.search_moves.
+        """
+        valid, msg = self._check_placement(tiles_placed)
+        words = self._find_formed_words(tiles_placed)
+        invalid_words = self.validate_words(words)
+        score = self._score_words(words, tiles_placed)
+        return valid, msg, tuple(words), tuple(invalid_words), score
+    
     def validate_placement(self, tiles_placed):
         """Valide le placement des tuiles"""
+        valid, msg, _, _, _ = self.analyze_placement(tiles_placed)
+        return valid, msg
+    
+    def _check_placement(self, tiles_placed):
         if not tiles_placed:
             return False, "Aucune tuile placée"
         
@@ -355,6 +986,9 @@ class ScrabbleGame:
     
     def get_formed_words(self, tiles_placed):
         """Récupère tous les mots formés par un placement"""
+        return list(self.analyze_placement(tiles_placed)[2])
+    
+    def _find_formed_words(self, tiles_placed):
         if not tiles_placed:
             return []
         
@@ -364,24 +998,25 @@ class ScrabbleGame:
         
         horizontal = len(set(rows)) == 1
         
-        # Créer une copie temporaire du plateau
-        temp_board = self.board.copy()
-        for row, col, letter in tiles_placed:
-            temp_board.set_cell(row, col, letter)
+        # Lire le plateau avec les nouvelles tuiles superposées (sans copie)
+        new_letters = {(row, col): letter for row, col, letter in tiles_placed}
+        
+        def get_cell(r, c):
+            return new_letters.get((r, c)) or self.board.get_cell(r, c)
         
         # Mot principal
         if horizontal:
             row = rows[0]
             # Trouver le début du mot
             start_col = min(cols)
-            while start_col > 0 and temp_board.get_cell(row, start_col - 1) is not None:
+            while start_col > 0 and get_cell(row, start_col - 1) is not None:
                 start_col -= 1
             
             # Construire le mot
             word = ""
             col = start_col
-            while col < BOARD_SIZE and temp_board.get_cell(row, col) is not None:
-                word += temp_board.get_cell(row, col)
+            while col < BOARD_SIZE and get_cell(row, col) is not None:
+                word += get_cell(row, col)
                 col += 1
             
             if len(word) > 1:
@@ -389,13 +1024,13 @@ class ScrabbleGame:
         else:
             col = cols[0]
             start_row = min(rows)
-            while start_row > 0 and temp_board.get_cell(start_row - 1, col) is not None:
+            while start_row > 0 and get_cell(start_row - 1, col) is not None:
                 start_row -= 1
             
             word = ""
             row = start_row
-            while row < BOARD_SIZE and temp_board.get_cell(row, col) is not None:
-                word += temp_board.get_cell(row, col)
+            while row < BOARD_SIZE and get_cell(row, col) is not None:
+                word += get_cell(row, col)
                 row += 1
             
             if len(word) > 1:
@@ -406,13 +1041,13 @@ class ScrabbleGame:
             if horizontal:
                 # Chercher mot vertical
                 start_row = row
-                while start_row > 0 and temp_board.get_cell(start_row - 1, col) is not None:
+                while start_row > 0 and get_cell(start_row - 1, col) is not None:
                     start_row -= 1
                 
                 word = ""
                 r = start_row
-                while r < BOARD_SIZE and temp_board.get_cell(r, col) is not None:
-                    word += temp_board.get_cell(r, col)
+                while r < BOARD_SIZE and get_cell(r, col) is not None:
+                    word += get_cell(r, col)
                     r += 1
                 
                 if len(word) > 1:
@@ -420,13 +1055,13 @@ class ScrabbleGame:
             else:
                 # Chercher mot horizontal
                 start_col = col
-                while start_col > 0 and temp_board.get_cell(row, start_col - 1) is not None:
+                while start_col > 0 and get_cell(row, start_col - 1) is not None:
                     start_col -= 1
                 
                 word = ""
                 c = start_col
-                while c < BOARD_SIZE and temp_board.get_cell(row, c) is not None:
-                    word += temp_board.get_cell(row, c)
+                while c < BOARD_SIZE and get_cell(row, c) is not None:
+                    word += get_cell(row, c)
                     c += 1
                 
                 if len(word) > 1:
@@ -438,13 +1073,15 @@ class ScrabbleGame:
         """Vérifie que tous les mots sont dans le dictionnaire"""
         invalid = []
         for word, _, _, _ in words:
-            if word.upper() not in DICTIONARY:
+            if word.upper() not in self.lexicon:
                 invalid.append(word)
         return invalid
     
     def calculate_move_score(self, tiles_placed):
         """Calcule le score total d'un coup"""
-        words = self.get_formed_words(tiles_placed)
+        return self.analyze_placement(tiles_placed)[4]
+    
+    def _score_words(self, words, tiles_placed):
         new_positions = set((r, c) for r, c, _ in tiles_placed)
         
         total_score = 0
@@ -459,32 +1096,27 @@ class ScrabbleGame:
     
     def play_move(self, tiles_placed):
         """Joue un coup"""
-        # Valider le placement
-        valid, msg = self.validate_placement(tiles_placed)
+        # Valider le placement et les mots formés (analyse en cache)
+        valid, msg, words, invalid_words, score = self.analyze_placement(tiles_placed)
         if not valid:
             return False, msg, 0
         
-        # Vérifier les mots formés
-        words = self.get_formed_words(tiles_placed)
         if not words:
             return False, "Aucun mot valide formé", 0
         
-        invalid_words = self.validate_words(words)
         if invalid_words:
             return False, f"Mots invalides: {', '.join(invalid_words)}", 0
         
-        # Calculer le score
-        score = self.calculate_move_score(tiles_placed)
+        # Les tuiles doivent venir du chevalet (minuscule = joker)
+        letters_used = [BLANK if letter.islower() else letter for _, _, letter in tiles_placed]
+        if not self.current_player().tiles.contains(letters_used):
+            return False, "Lettres non disponibles sur le chevalet", 0
         
         # Appliquer le coup
-        for row, col, letter in tiles_placed:
-            self.board.set_cell(row, col, letter)
-        
-        self.board.first_move = False
+        self.board.place_tiles(tiles_placed)
         self.current_player().score += score
         
         # Retirer les lettres du chevalet
-        letters_used = [letter for _, _, letter in tiles_placed]
         self.current_player().remove_letters(letters_used)
         
         # Piocher de nouvelles lettres
@@ -512,9 +1144,8 @@ class ScrabbleGame:
             return False, "Pas assez de lettres dans le sac"
         
         player = self.current_player()
-        for letter in letters:
-            if letter not in player.rack:
-                return False, f"Lettre {letter} non disponible"
+        if not player.tiles.contains(letters):
+            return False, "Lettres non disponibles sur le chevalet"
         
         # Retirer les lettres
         player.remove_letters(letters)
@@ -524,8 +1155,7 @@ class ScrabbleGame:
         player.add_letters(new_letters)
         
         # Remettre les lettres dans le sac
-        self.bag.letters.extend(letters)
-        random.shuffle(self.bag.letters)
+        self.bag.put_back(letters)
         
         self.consecutive_passes = 0
         self.next_turn()
@@ -535,162 +1165,275 @@ class ScrabbleGame:
 
 # ==================== IA MINIMAX ====================
 
+class MoveGenerator:
+    """Générateur de coups d'Appel-Jacobson guidé par le DAWG.
+    
+    Depuis chaque case d'ancrage, seuls les préfixes du dictionnaire réalisables
+    avec le chevalet sont explorés ; les contre-vérifications tenues à jour par
+    le plateau éliminent les lettres interdites au moment du placement.
+    """
+    
+    def __init__(self, lexicon, max_tiles=7):
+        self.lexicon = lexicon
+        self.max_tiles = max_tiles  # tuiles du chevalet posées au plus par coup
+    
+    def generate(self, board, rack, anchors):
+        """Retourne la liste des coups légaux [(Move, tuiles), ...]"""
+        self.board = board
+        # Compteurs modifiés sur place pendant l'exploration puis restaurés
+        self.rack = TileCounts(rack)
+        self.anchors = anchors
+        self.moves = []
+        self.seen_single = set()
+        
+        for horizontal in (True, False):
+            self.horizontal = horizontal
+            self.cross_checks = board.cross_checks[horizontal]
+            self.cross_scores = board.cross_scores[horizontal]
+            for row, col in sorted(anchors):
+                line, pos = (row, col) if horizontal else (col, row)
+                self.line = line
+                self._generate_at_anchor(pos)
+        
+        return self.moves
+    
+    def _cell(self, pos):
+        if self.horizontal:
+            return self.board.get_cell(self.line, pos)
+        return self.board.get_cell(pos, self.line)
+    
+    def _square(self, pos):
+        return (self.line, pos) if self.horizontal else (pos, self.line)
+    
+    def _generate_at_anchor(self, anchor):
+        lexicon = self.lexicon
+        
+        if anchor > 0 and self._cell(anchor - 1) is not None:
+            # Préfixe déjà posé sur le plateau
+            start = anchor - 1
+            while start > 0 and self._cell(start - 1) is not None:
+                start -= 1
+            state = lexicon.follow(lexicon.root, (self._cell(p) for p in range(start, anchor)))
+            if state is None:
+                return
+            self.word_start = start
+            self._extend_right(state[0], state[1], anchor, [], anchor)
+        else:
+            # Préfixe libre : cases vides qui ne sont pas des ancres
+            limit = 0
+            pos = anchor - 1
+            while pos >= 0 and self._cell(pos) is None and self._square(pos) not in self.anchors:
+                limit += 1
+                pos -= 1
+            limit = min(limit, self.max_tiles - 1)
+            self._left_part(lexicon.root, False, limit, [], anchor)
+    
+    def _left_part(self, node, terminal, limit, left, anchor):
+        self.word_start = anchor - len(left)
+        placed = [(self.word_start + i, letter) for i, letter in enumerate(left)]
+        self._extend_right(node, terminal, anchor, placed, anchor)
+        
+        if limit == 0:
+            return
+        
+        rack = self.rack.counts
+        edges = self.lexicon.edges
+        i = node
+        while i:
+            edge = edges[i]
+            i = 0 if edge & EDGE_LAST else i + 1
+            index = edge & EDGE_LETTER_MASK
+            letter = ALPHABET[index]
+            child = edge >> EDGE_CHILD_SHIFT
+            is_word = bool(edge & EDGE_TERMINAL)
+            for slot in (index, BLANK_SLOT):
+                if rack[slot] > 0:
+                    rack[slot] -= 1
+                    left.append(letter if slot != BLANK_SLOT else letter.lower())
+                    self._left_part(child, is_word, limit - 1, left, anchor)
+                    left.pop()
+                    rack[slot] += 1
+    
+    def _extend_right(self, node, terminal, pos, placed, anchor):
+        letter = self._cell(pos) if pos < BOARD_SIZE else None
+        
+        if letter is not None:
+            # Case occupée : suivre la lettre du plateau
+            edge = self.lexicon.find_edge(node, letter)
+            if edge:
+                self._extend_right(edge >> EDGE_CHILD_SHIFT, bool(edge & EDGE_TERMINAL),
+                                   pos + 1, placed, anchor)
+            return
+        
+        if terminal and pos > anchor:
+            self._record(placed, pos)
+        
+        if pos >= BOARD_SIZE or not node or len(placed) >= self.max_tiles:
+            return
+        
+        row, col = self._square(pos)
+        allowed = self.cross_checks[row * BOARD_SIZE + col]
+        rack = self.rack.counts
+        edges = self.lexicon.edges
+        i = node
+        while i:
+            edge = edges[i]
+            i = 0 if edge & EDGE_LAST else i + 1
+            index = edge & EDGE_LETTER_MASK
+            if not allowed >> index & 1:
+                continue
+            letter = ALPHABET[index]
+            child = edge >> EDGE_CHILD_SHIFT
+            is_word = bool(edge & EDGE_TERMINAL)
+            for slot in (index, BLANK_SLOT):
+                if rack[slot] > 0:
+                    rack[slot] -= 1
+                    placed.append((pos, letter if slot != BLANK_SLOT else letter.lower()))
+                    self._extend_right(child, is_word, pos + 1, placed, anchor)
+                    placed.pop()
+                    rack[slot] += 1
+    
+    def _record(self, placed, end):
+        tiles = []
+        for pos, letter in placed:
+            row, col = self._square(pos)
+            tiles.append((row, col, letter))
+        
+        # Un coup d'une seule tuile peut être trouvé dans les deux directions
+        if len(tiles) == 1:
+            if tiles[0] in self.seen_single:
+                return
+            self.seen_single.add(tiles[0])
+        
+        # Score calculé directement à partir des scores croisés du plateau
+        cross_scores = self.cross_scores
+        new_letters = dict(placed)
+        word = ""
+        main_score = 0
+        word_multiplier = 1
+        cross_total = 0
+        for pos in range(self.word_start, end):
+            letter = new_letters.get(pos)
+            if letter is None:
+                letter = self._cell(pos)
+                word += letter
+                main_score += 0 if letter.islower() else LETTER_VALUES[letter]
+                continue
+            
+            word += letter
+            row, col = self._square(pos)
+            index = row * BOARD_SIZE + col
+            letter_score = 0 if letter.islower() else LETTER_VALUES[letter]
+            letter_score *= LETTER_MULTIPLIERS[index]
+            square_word_multiplier = WORD_MULTIPLIERS[index]
+            main_score += letter_score
+            word_multiplier *= square_word_multiplier
+            
+            cross_score = cross_scores[index]
+            if cross_score is not None:
+                cross_total += (cross_score + letter_score) * square_word_multiplier
+        
+        letters_used = [BLANK if letter.islower() else letter for _, letter in placed]
+        row, col = self._square(self.word_start)
+        move = Move(word.upper(), row, col, self.horizontal, letters_used)
+        move.leave = self.rack.key()
+        move.score = main_score * word_multiplier + cross_total
+        if len(placed) == 7:
+            move.score += 50
+        self.moves.append((move, tiles))
+
+
+class SearchTimeout(Exception):
+    """Levée quand la recherche dépasse son budget de temps"""
+
+
 class ScrabbleAI:
     """IA utilisant Minimax pour jouer au Scrabble"""
     
-    def __init__(self, game, max_depth=2):
+    def __init__(self, game, max_depth=2, lexicon=None, time_limit=2.0, max_moves=20,
+                 simulation=False, sim_candidates=10, sim_plies=2, workers=None, leaves=None,
+                 difficulty=None):
         self.game = game
-        self.max_depth = max_depth
+        self.leaves = leaves if leaves is not None else LEAVES
+        self.max_depth = max_depth  # profondeur maximale de l'approfondissement itératif
+        self.time_limit = time_limit  # secondes par tour, génération de la racine comprise
+        self.max_moves = max_moves  # coups explorés par nœud interne
+        self.deadline = 0.0
+        self.generator = MoveGenerator(lexicon or game.lexicon)
+        
+        # Statistiques cumulées de génération de coups
+        self.generation_count = 0
+        self.generation_time = 0.0
+        self.moves_generated = 0
+        
+        # Coups des nœuds internes, réutilisés d'un demi-coup et d'une profondeur à l'autre
+        self.search_cache = SearchCache()
+        
+        # Suivi de la recherche (lu par l'interface depuis un autre thread)
+        self.progress = 0  # coups évalués pendant la recherche en cours
+        self.depth_reached = 0  # dernière profondeur entièrement explorée
+        self.stop_event = threading.Event()
+        
+        # Mode simulation Monte-Carlo
+        self.simulation = simulation
+        self.sim_candidates = sim_candidates
+        self.sim_plies = sim_plies
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = None
+        
+        self.difficulty = None
+        if difficulty is not None:
+            self.set_difficulty(difficulty)
+    
+    def set_difficulty(self, level):
+        """Applique un niveau de DIFFICULTY_LEVELS"""
+        preset = DIFFICULTY_LEVELS[level]
+        self.difficulty = level
+        self.generator.max_tiles = preset['max_tiles']
+        self.max_moves = preset['max_moves']
+        self.max_depth = preset['max_depth']
+        self.time_limit = preset['budget_ms'] / 1000
+        self.simulation = preset['sim_candidates'] > 0
+        if self.simulation:
+            self.sim_candidates = preset['sim_candidates']
+            self.sim_plies = preset['sim_plies']
     
     def find_all_moves(self, board, rack):
         """Trouve tous les coups possibles"""
-        moves = []
-        rack_letters = list(rack)
-        
+        start = time.perf_counter()
         if board.first_move:
             # Premier coup: doit passer par le centre
-            moves.extend(self._find_moves_at_position(board, rack_letters, CENTER, CENTER, True))
-            moves.extend(self._find_moves_at_position(board, rack_letters, CENTER, CENTER, False))
+            anchors = {(CENTER, CENTER)}
         else:
-            # Trouver toutes les positions d'ancrage
-            anchors = self._find_anchors(board)
-            for row, col in anchors:
-                moves.extend(self._find_moves_at_anchor(board, rack_letters, row, col))
+            # Ancres tenues à jour par le plateau à chaque pose
+            anchors = board.anchors
         
+        moves = self.generator.generate(board, rack, anchors)
+        self.generation_time += time.perf_counter() - start
+        self.generation_count += 1
+        self.moves_generated += len(moves)
         return moves
     
-    def _find_anchors(self, board):
-        """Trouve les cases d'ancrage (adjacentes à des lettres existantes)"""
-        anchors = set()
-        for row in range(BOARD_SIZE):
-            for col in range(BOARD_SIZE):
-                if board.is_empty(row, col):
-                    # Vérifier si adjacent à une lettre
-                    for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                        nr, nc = row + dr, col + dc
-                        if 0 <= nr < BOARD_SIZE and 0 <= nc < BOARD_SIZE:
-                            if not board.is_empty(nr, nc):
-                                anchors.add((row, col))
-                                break
-        return anchors
-    
-    def _find_moves_at_position(self, board, rack, row, col, horizontal):
-        """Trouve les mots possibles passant par une position"""
-        moves = []
-        
-        # Essayer différentes combinaisons de lettres
-        for length in range(2, min(8, len(rack) + 1)):
-            for word in DICTIONARY:
-                if len(word) <= length:
-                    # Vérifier si on peut former ce mot
-                    letters_needed = list(word.upper())
-                    rack_copy = rack[:]
-                    can_form = True
-                    letters_used = []
-                    
-                    for letter in letters_needed:
-                        if letter in rack_copy:
-                            rack_copy.remove(letter)
-                            letters_used.append(letter)
-                        elif '*' in rack_copy:  # Joker
-                            rack_copy.remove('*')
-                            letters_used.append('*')
-                        else:
-                            can_form = False
-                            break
-                    
-                    if can_form:
-                        # Essayer de placer le mot
-                        for start_offset in range(len(word)):
-                            if horizontal:
-                                start_col = col - start_offset
-                                if start_col >= 0 and start_col + len(word) <= BOARD_SIZE:
-                                    tiles = [(row, start_col + i, word[i]) for i in range(len(word))]
-                                    move = Move(word, row, start_col, True, letters_used)
-                                    moves.append((move, tiles))
-                            else:
-                                start_row = row - start_offset
-                                if start_row >= 0 and start_row + len(word) <= BOARD_SIZE:
-                                    tiles = [(start_row + i, col, word[i]) for i in range(len(word))]
-                                    move = Move(word, start_row, col, False, letters_used)
-                                    moves.append((move, tiles))
-        
-        return moves
-    
-    def _find_moves_at_anchor(self, board, rack, anchor_row, anchor_col):
-        """Trouve les coups possibles à une position d'ancrage"""
-        moves = []
-        
-        for horizontal in [True, False]:
-            # Trouver le préfixe existant
-            if horizontal:
-                prefix = ""
-                col = anchor_col - 1
-                while col >= 0 and not board.is_empty(anchor_row, col):
-                    prefix = board.get_cell(anchor_row, col) + prefix
-                    col -= 1
-                start_col = col + 1
-            else:
-                prefix = ""
-                row = anchor_row - 1
-                while row >= 0 and not board.is_empty(row, anchor_col):
-                    prefix = board.get_cell(row, anchor_col) + prefix
-                    row -= 1
-                start_row = row + 1
-            
-            # Essayer d'étendre avec des mots du dictionnaire
-            for word in DICTIONARY:
-                word_upper = word.upper()
-                if prefix and not word_upper.startswith(prefix.upper()):
-                    continue
-                
-                # Calculer les lettres nécessaires
-                suffix = word_upper[len(prefix):]
-                if not suffix:
-                    continue
-                
-                rack_copy = rack[:]
-                letters_used = []
-                can_form = True
-                
-                for letter in suffix:
-                    if letter in rack_copy:
-                        rack_copy.remove(letter)
-                        letters_used.append(letter)
-                    elif '*' in rack_copy:
-                        rack_copy.remove('*')
-                        letters_used.append('*')
-                    else:
-                        can_form = False
-                        break
-                
-                if can_form:
-                    if horizontal:
-                        if start_col + len(word_upper) <= BOARD_SIZE:
-                            tiles = []
-                            for i, letter in enumerate(word_upper):
-                                c = start_col + i
-                                if board.is_empty(anchor_row, c):
-                                    tiles.append((anchor_row, c, letter))
-                            if tiles:
-                                move = Move(word_upper, anchor_row, start_col, True, letters_used)
-                                moves.append((move, tiles))
-                    else:
-                        if start_row + len(word_upper) <= BOARD_SIZE:
-                            tiles = []
-                            for i, letter in enumerate(word_upper):
-                                r = start_row + i
-                                if board.is_empty(r, anchor_col):
-                                    tiles.append((r, anchor_col, letter))
-                            if tiles:
-                                move = Move(word_upper, start_row, anchor_col, False, letters_used)
-                                moves.append((move, tiles))
-        
+    def search_moves(self, board, rack):
+        """Coups explorés depuis un nœud : triés par évaluation, limités à max_moves.
+        
+        Mis en cache par (empreinte du plateau, chevalet) : l'approfondissement
+        itératif et les transpositions retrouvent les mêmes nœuds, dont les coups
+        et leur ordre sont alors relus au lieu d'être régénérés.
+        """
+        key = (board.hash, rack.key(), self.generator.max_tiles, self.max_moves)
+        moves = self.search_cache.get(key)
+        if moves is None:
+            moves = self.find_all_moves(board, rack)
+            # Ordonner par score statique pour maximiser les coupures
+            moves.sort(key=lambda m: self.evaluate_move(*m), reverse=True)
+            moves = moves[:self.max_moves]  # Limiter pour la performance
+            self.search_cache.put(key, moves)
         return moves
     
     def evaluate_move(self, move, tiles):
         """Évalue un coup (heuristique)"""
-        score = self.game.calculate_move_score(tiles)
+        score = move.score
         
         # Bonus pour utiliser des lettres difficiles
         for letter in move.letters_used:
@@ -700,56 +1443,101 @@ class ScrabbleAI:
         # Bonus pour utiliser plus de lettres
         score += len(tiles) * 2
         
+        # Valeur des lettres gardées sur le chevalet
+        if move.leave is not None:
+            score += self.leaves.value(move.leave)
+        
         return score
     
-    def minimax(self, board, rack, depth, is_maximizing, alpha, beta):
-        """Algorithme Minimax avec élagage alpha-beta"""
+    def minimax(self, board, racks, bag, depth, is_maximizing, alpha, beta, moves=None):
+        """Algorithme Minimax avec élagage alpha-beta.
+        
+        Les coups sont réellement joués sur `board` puis annulés (place_tiles/undo),
+        et chaque camp repioche dans `bag`. La valeur est l'écart de points
+        IA - adversaire cumulé sur `depth` demi-coups.
+        
+        `alpha` et `beta` bornent la valeur cumulée depuis ce nœud. Le score du
+        coup joué s'ajoute à celle du fils : la fenêtre du fils est donc décalée
+        de ce score, pour que ses coupures comparent des valeurs de même nature.
+        """
         if depth == 0:
             return 0, None
+        if self.stop_event.is_set() or time.perf_counter() > self.deadline:
+            raise SearchTimeout()
         
-        moves = self.find_all_moves(board, rack)
+        side = 0 if is_maximizing else 1
+        rack = racks[side]
+        if moves is None:
+            moves = self.search_moves(board, rack)
         
         if not moves:
-            return 0, None
+            # Le camp passe son tour (score nul : fenêtre inchangée)
+            value, _ = self.minimax(board, racks, bag, depth - 1, not is_maximizing, alpha, beta)
+            return value, None
         
-        if is_maximizing:
-            max_eval = float('-inf')
-            best_move = None
-            
-            for move, tiles in moves[:20]:  # Limiter pour la performance
-                # Simuler le coup
-                eval_score = self.evaluate_move(move, tiles)
-                
-                if eval_score > max_eval:
-                    max_eval = eval_score
-                    best_move = (move, tiles)
-                
-                alpha = max(alpha, eval_score)
-                if beta <= alpha:
-                    break
+        best_value = float('-inf') if is_maximizing else float('inf')
+        best_move = None
+        
+        for move, tiles in moves:
+            self.progress += 1
+            eval_score = self.evaluate_move(move, tiles)
+            shift = eval_score if is_maximizing else -eval_score
             
-            return max_eval, best_move
-        else:
-            min_eval = float('inf')
-            best_move = None
+            # Jouer le coup
+            state = board.place_tiles(tiles)
+            new_rack = rack.copy()
+            new_rack.remove(move.letters_used)
+            drawn = bag.draw(len(move.letters_used))
+            new_rack.add(drawn)
+            racks[side] = new_rack
+            try:
+                value, _ = self.minimax(board, racks, bag, depth - 1, not is_maximizing,
+                                        alpha - shift, beta - shift)
+            finally:
+                # Annuler le coup
+                racks[side] = rack
+                bag.put_back(drawn)
+                board.undo(state)
             
-            for move, tiles in moves[:20]:
-                eval_score = self.evaluate_move(move, tiles)
-                
-                if eval_score < min_eval:
-                    min_eval = eval_score
+            if is_maximizing:
+                value += eval_score
+                if value > best_value:
+                    best_value = value
                     best_move = (move, tiles)
-                
-                beta = min(beta, eval_score)
-                if beta <= alpha:
-                    break
+                alpha = max(alpha, value)
+            else:
+                value -= eval_score
+                if value < best_value:
+                    best_value = value
+                    best_move = (move, tiles)
+                beta = min(beta, value)
             
-            return min_eval, best_move
+            if beta <= alpha:
+                break
+        
+        return best_value, best_move
+    
+    def unseen_tiles(self, rack):
+        """Tuiles invisibles pour l'IA : sac + chevalet adverse"""
+        counts = TileCounts(letter for letter, count in LETTER_DISTRIBUTION.items()
+                            for _ in range(count))
+        counts.remove(BLANK if chr(code).islower() else chr(code)
+                      for code in self.game.board.cells if code)
+        counts.remove(rack)
+        return counts.elements()
+    
+    def request_stop(self):
+        """Interrompt la recherche en cours ; find_best_move rend le meilleur coup trouvé"""
+        self.stop_event.set()
     
     def find_best_move(self):
         """Trouve le meilleur coup pour l'IA"""
         player = self.game.current_player()
-        rack = player.rack[:]
+        rack = player.tiles.copy()
+        self.progress = 0
+        self.depth_reached = 0
+        # Le budget couvre tout le tour, génération de la racine comprise
+        self.deadline = time.perf_counter() + self.time_limit
         
         # Trouver tous les coups possibles
         moves = self.find_all_moves(self.game.board, rack)
@@ -757,28 +1545,177 @@ class ScrabbleAI:
         if not moves:
             return None
         
-        # Évaluer chaque coup
-        best_score = float('-inf')
-        best_move = None
-        
-        for move, tiles in moves:
-            # Valider le coup
-            valid, _ = self.game.validate_placement(tiles)
-            if not valid:
-                continue
+        # Les coups générés sont légaux par construction (contre-vérifications)
+        moves.sort(key=lambda m: self.evaluate_move(*m), reverse=True)
+        best_move = moves[0][1]
+        self.depth_reached = 1
+        
+        if self.simulation:
+            return self.simulate(self.game.board.copy(), rack, moves[:self.sim_candidates])
+        
+        if self.max_depth <= 1:
+            return best_move
+        
+        # Recherche sur une copie du plateau avec un chevalet adverse tiré
+        # parmi les tuiles invisibles
+        bag = Bag(self.unseen_tiles(rack))
+        racks = [rack, TileCounts(bag.draw(7))]
+        board = self.game.board.copy()
+        
+        # La racine est limitée comme les nœuds internes : max_moves règle la
+        # largeur de toute la recherche
+        moves = moves[:self.max_moves]
+        
+        # Approfondissement itératif jusqu'à max_depth ou à l'échéance. La racine
+        # est évaluée coup par coup, le meilleur coup de la profondeur précédente
+        # en premier : une profondeur interrompue ne retient que des coups
+        # entièrement évalués, au moins aussi bons que ce meilleur coup.
+        for depth in range(2, self.max_depth + 1):
+            best_value = float('-inf')
+            depth_best = None
+            timed_out = False
+            for move, tiles in moves:
+                try:
+                    value, _ = self.minimax(board, racks, bag, depth, True,
+                                            best_value, float('inf'), [(move, tiles)])
+                except SearchTimeout:
+                    timed_out = True
+                    break
+                if value > best_value:
+                    best_value = value
+                    depth_best = (move, tiles)
             
-            words = self.game.get_formed_words(tiles)
-            invalid = self.game.validate_words(words)
-            if invalid:
-                continue
+            if depth_best is not None:
+                best_move = depth_best[1]
+                moves.remove(depth_best)
+                moves.insert(0, depth_best)
+            if timed_out:
+                break
+            self.depth_reached = depth
+        
+        return best_move
+    
+    
+    # ---------- Simulation Monte-Carlo ----------
+    
+    def simulate(self, board, rack, candidates):
+        """Choisit parmi les candidats par équité moyenne sur des chevalets adverses aléatoires"""
+        if len(candidates) <= 1:
+            return candidates[0][1] if candidates else None
+        
+        unseen = self.unseen_tiles(rack)
+        budget = max(0.0, self.deadline - time.perf_counter())
+        
+        if self.workers <= 1:
+            totals, iterations = self.run_simulations(board, rack, unseen, candidates,
+                                                      self.sim_plies, budget, random.random())
+        else:
+            # Les processus simulent par tranches courtes pour que la progression
+            # et l'arrêt restent réactifs ; les résultats sont cumulés
+            executor = self._get_executor()
+            state = board.snapshot()
+            deadline = time.perf_counter() + budget
+            totals = [0.0] * len(candidates)
+            iterations = 0
+            pending = set()
+            while not self.stop_event.is_set():
+                remaining = deadline - time.perf_counter()
+                if remaining > 0:
+                    while len(pending) < self.workers:
+                        pending.add(executor.submit(_simulation_task, state, rack, unseen, candidates,
+                                                    self.sim_plies, min(SIM_SLICE, remaining),
+                                                    random.random()))
+                elif not pending:
+                    break
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    worker_totals, worker_iterations = future.result()
+                    totals = [a + b for a, b in zip(totals, worker_totals)]
+                    iterations += worker_iterations
+                    self.progress += worker_iterations * len(candidates)
+        
+        if iterations == 0:
+            # Budget trop court : garder l'ordre statique
+            return candidates[0][1]
+        
+        best = max(range(len(candidates)), key=lambda i: totals[i])
+        return candidates[best][1]
+    
+    def run_simulations(self, board, rack, unseen, candidates, plies, budget, seed):
+        """Joue 1 ou 2 demi-coups gloutons après chaque candidat jusqu'à la fin du budget.
+        
+        Chaque itération tire un chevalet adverse parmi les tuiles invisibles et
+        l'applique à tous les candidats (mêmes tirages pour tous, ce qui réduit
+        la variance). Retourne (équités cumulées par candidat, itérations).
+        """
+        rng = random.Random(seed)
+        deadline = time.perf_counter() + budget
+        totals = [0.0] * len(candidates)
+        iterations = 0
+        pool = list(unseen)
+        
+        while time.perf_counter() < deadline and not self.stop_event.is_set():
+            rng.shuffle(pool)
+            opponent_rack = pool[:7]
+            refill = pool[7:]
             
-            score = self.evaluate_move(move, tiles)
+            for i, (move, tiles) in enumerate(candidates):
+                state = board.place_tiles(tiles)
+                equity = self.evaluate_move(move, tiles)
+                
+                # Meilleure réponse adverse
+                reply_state = None
+                replies = self.find_all_moves(board, opponent_rack)
+                if replies:
+                    reply_move, reply_tiles = max(replies, key=lambda m: m[0].score)
+                    equity -= reply_move.score
+                    reply_state = board.place_tiles(reply_tiles)
+                
+                # Notre coup suivant avec le reliquat et la pioche
+                if plies >= 2:
+                    next_rack = TileCounts(rack)
+                    next_rack.remove(move.letters_used)
+                    next_rack.add(refill[:len(move.letters_used)])
+                    follow_ups = self.find_all_moves(board, next_rack)
+                    if follow_ups:
+                        equity += max(m.score for m, _ in follow_ups)
+                
+                if reply_state is not None:
+                    board.undo(reply_state)
+                board.undo(state)
+                totals[i] += equity
+                self.progress += 1
             
-            if score > best_score:
-                best_score = score
-                best_move = tiles
+            iterations += 1
         
-        return best_move
+        return totals, iterations
+    
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 initializer=_init_simulation_worker,
+                                                 initargs=(self.generator.lexicon,))
+        return self._executor
+    
+    def close(self):
+        """Arrête les processus de simulation"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# État propre à chaque processus de simulation
+_worker_ai = None
+
+
+def _init_simulation_worker(lexicon):
+    global _worker_ai
+    _worker_ai = ScrabbleAI(None, lexicon=lexicon, workers=1)
+
+
+def _simulation_task(board_state, rack, unseen, candidates, plies, budget, seed):
+    board = Board.from_snapshot(board_state, _worker_ai.generator.lexicon)
+    return _worker_ai.run_simulations(board, rack, unseen, candidates, plies, budget, seed)
 
 
 # ==================== INTERFACE TKINTER ====================
@@ -786,17 +1723,17 @@ class ScrabbleAI:
 class ScrabbleGUI:
     """Interface graphique du Scrabble"""
     
-    def __init__(self):
+    def __init__(self, lexicon=LEXICON):
         self.root = tk.Tk()
         self.root.title("Scrabble - Joueur vs IA Minimax")
         self.root.configure(bg='#2C3E50')
         
         # Initialiser le jeu
-        self.game = ScrabbleGame()
+        self.game = ScrabbleGame(lexicon)
         self.game.add_player("Joueur", is_ai=False)
         self.game.add_player("IA Minimax", is_ai=True)
         
-        self.ai = ScrabbleAI(self.game)
+        self.ai = ScrabbleAI(self.game, difficulty=DEFAULT_DIFFICULTY)
         
         # Variables d'interface
         self.selected_letter = None
@@ -804,6 +1741,9 @@ class ScrabbleGUI:
         self.tiles_placed = []  # [(row, col, letter), ...]
         self.cell_buttons = {}
         self.rack_buttons = []
+        # Apparence affichée des cases qui ne sont pas dans leur état vide :
+        # {(row, col): (texte, couleur, police)}, pour ne reconfigurer que les différences
+        self.rendered_cells = {}
         
         self._create_widgets()
         self._update_display()
@@ -829,29 +1769,9 @@ class ScrabbleGUI:
         
         for row in range(BOARD_SIZE):
             for col in range(BOARD_SIZE):
-                # Déterminer la couleur de la case
-                color = COLORS['board']
-                text = ""
-                
-                if (row, col) in TRIPLE_WORD:
-                    color = COLORS['triple_word']
-                    text = "MT"
-                elif (row, col) in DOUBLE_WORD:
-                    color = COLORS['double_word']
-                    text = "MD"
-                elif (row, col) in TRIPLE_LETTER:
-                    color = COLORS['triple_letter']
-                    text = "LT"
-                elif (row, col) in DOUBLE_LETTER:
-                    color = COLORS['double_letter']
-                    text = "LD"
-                
-                if row == CENTER and col == CENTER:
-                    color = COLORS['center']
-                    text = "★"
-                
+                text, color, font = self._empty_cell_style(row, col)
                 btn = tk.Button(board_frame, text=text, width=3, height=1,
-                               font=('Arial', 10, 'bold'), bg=color,
+                               font=font, bg=color,
                                relief=tk.RAISED, borderwidth=2,
                                command=lambda r=row, c=col: self._on_cell_click(r, c))
                 btn.grid(row=row, column=col, padx=1, pady=1)
@@ -937,6 +1857,48 @@ class ScrabbleGUI:
                                       command=self._exchange_letters)
         self.exchange_btn.pack(pady=5)
         
+        # Réflexion de l'IA
+        ai_frame = tk.LabelFrame(right_frame, text="IA", font=('Arial', 12, 'bold'),
+                                 bg='#34495E', fg='white', padx=10, pady=5)
+        ai_frame.pack(fill=tk.X, pady=5)
+        
+        self.difficulty_var = tk.StringVar(value=self.ai.difficulty)
+        difficulty_row = tk.Frame(ai_frame, bg='#34495E')
+        difficulty_row.pack(fill=tk.X)
+        tk.Label(difficulty_row, text="Niveau :", font=('Arial', 9),
+                 bg='#34495E', fg='white').pack(side=tk.LEFT)
+        difficulty_menu = ttk.Combobox(difficulty_row, textvariable=self.difficulty_var,
+                                       values=list(DIFFICULTY_LEVELS), state='readonly', width=10)
+        difficulty_menu.pack(side=tk.LEFT, padx=5)
+        difficulty_menu.bind('<<ComboboxSelected>>', self._on_difficulty_change)
+        
+        # Simulation Monte-Carlo sur tous les cœurs à la place du minimax
+        self.simulation_var = tk.BooleanVar(value=self.ai.simulation)
+        tk.Checkbutton(ai_frame, text="Simulation Monte-Carlo", variable=self.simulation_var,
+                       command=self._on_simulation_change, font=('Arial', 9),
+                       bg='#34495E', fg='white', selectcolor='#2C3E50',
+                       activebackground='#34495E', activeforeground='white').pack(anchor=tk.W)
+        
+        self.time_limit_var = tk.DoubleVar(value=self.ai.time_limit)
+        tk.Scale(ai_frame, label="Temps de réflexion (s)", variable=self.time_limit_var,
+                 from_=0.1, to=10, resolution=0.1, orient=tk.HORIZONTAL,
+                 bg='#34495E', fg='white', highlightthickness=0).pack(fill=tk.X)
+        
+        self.ai_progress = ttk.Progressbar(ai_frame, mode='determinate', maximum=1.0)
+        self.ai_progress.pack(fill=tk.X, pady=2)
+        self.ai_progress_label = tk.Label(ai_frame, text="", font=('Arial', 9),
+                                          bg='#34495E', fg='white')
+        self.ai_progress_label.pack()
+        
+        ai_buttons = tk.Frame(ai_frame, bg='#34495E')
+        ai_buttons.pack(pady=2)
+        self.ai_stop_btn = tk.Button(ai_buttons, text="Jouer maintenant", font=('Arial', 9),
+                                     state=tk.DISABLED, command=self._stop_ai)
+        self.ai_stop_btn.pack(side=tk.LEFT, padx=2)
+        self.ai_cancel_btn = tk.Button(ai_buttons, text="Annuler", font=('Arial', 9),
+                                       state=tk.DISABLED, command=self._cancel_ai)
+        self.ai_cancel_btn.pack(side=tk.LEFT, padx=2)
+        
         # Message
         self.message_label = tk.Label(right_frame, text="", font=('Arial', 11),
                                       bg='#2C3E50', fg='#F39C12', wraplength=200)
@@ -956,45 +1918,7 @@ class ScrabbleGUI:
         self.bag_label.config(text=f"Sac: {self.game.bag.remaining()} lettres")
         
         # Mettre à jour le plateau
-        for row in range(BOARD_SIZE):
-            for col in range(BOARD_SIZE):
-                letter = self.game.board.get_cell(row, col)
-                btn = self.cell_buttons[(row, col)]
-                
-                if letter:
-                    btn.config(text=letter, bg=COLORS['tile'], font=('Arial', 12, 'bold'))
-                else:
-                    # Restaurer la couleur originale
-                    color = COLORS['board']
-                    text = ""
-                    
-                    if (row, col) in TRIPLE_WORD:
-                        color = COLORS['triple_word']
-                        text = "MT"
-                    elif (row, col) in DOUBLE_WORD:
-                        color = COLORS['double_word']
-                        text = "MD"
-                    elif (row, col) in TRIPLE_LETTER:
-                        color = COLORS['triple_letter']
-                        text = "LT"
-                    elif (row, col) in DOUBLE_LETTER:
-                        color = COLORS['double_letter']
-                        text = "LD"
-                    
-                    if row == CENTER and col == CENTER:
-                        color = COLORS['center']
-                        text = "★"
-                    
-                    # Vérifier si une tuile a été placée temporairement
-                    placed = False
-                    for pr, pc, pl in self.tiles_placed:
-                        if pr == row and pc == col:
-                            btn.config(text=pl, bg=COLORS['placed'], font=('Arial', 12, 'bold'))
-                            placed = True
-                            break
-                    
-                    if not placed:
-                        btn.config(text=text, bg=color, font=('Arial', 10, 'bold'))
+        self._update_board()
         
         # Mettre à jour le chevalet
         self._update_rack()
@@ -1006,6 +1930,52 @@ class ScrabbleGUI:
         self.pass_btn.config(state=tk.NORMAL if is_human_turn else tk.DISABLED)
         self.exchange_btn.config(state=tk.NORMAL if is_human_turn else tk.DISABLED)
     
+    def _empty_cell_style(self, row, col):
+        """Apparence d'une case vide : (texte, couleur, police)"""
+        color = COLORS['board']
+        text = ""
+        
+        if (row, col) in TRIPLE_WORD:
+            color = COLORS['triple_word']
+            text = "MT"
+        elif (row, col) in DOUBLE_WORD:
+            color = COLORS['double_word']
+            text = "MD"
+        elif (row, col) in TRIPLE_LETTER:
+            color = COLORS['triple_letter']
+            text = "LT"
+        elif (row, col) in DOUBLE_LETTER:
+            color = COLORS['double_letter']
+            text = "LD"
+        
+        if row == CENTER and col == CENTER:
+            color = COLORS['center']
+            text = "★"
+        
+        return text, color, ('Arial', 10, 'bold')
+    
+    def _update_board(self):
+        """Reconfigure uniquement les cases dont l'apparence a changé"""
+        wanted = {}
+        for index, code in enumerate(self.game.board.cells):
+            if code:
+                wanted[divmod(index, BOARD_SIZE)] = (chr(code), COLORS['tile'], ('Arial', 12, 'bold'))
+        # Tuiles placées temporairement (sur des cases vides)
+        for row, col, letter in self.tiles_placed:
+            wanted.setdefault((row, col), (letter, COLORS['placed'], ('Arial', 12, 'bold')))
+        
+        # Cases redevenues vides (coup annulé, tuile reprise)
+        for square in self.rendered_cells.keys() - wanted.keys():
+            text, color, font = self._empty_cell_style(*square)
+            self.cell_buttons[square].config(text=text, bg=color, font=font)
+        
+        for square, style in wanted.items():
+            if self.rendered_cells.get(square) != style:
+                text, color, font = style
+                self.cell_buttons[square].config(text=text, bg=color, font=font)
+        
+        self.rendered_cells = wanted
+    
     def _update_rack(self):
         """Met à jour l'affichage du chevalet"""
         # Supprimer les anciens boutons
@@ -1068,8 +2038,17 @@ class ScrabbleGUI:
                 if pr == row and pc == col:
                     return
             
+            letter = self.selected_letter
+            if letter == '*':
+                # Le joker prend la valeur d'une lettre choisie (affichée en minuscule)
+                choice = simpledialog.askstring("Joker", "Quelle lettre représente le joker ?",
+                                                parent=self.root)
+                if not choice or choice.strip().upper() not in LETTER_INDEX:
+                    return
+                letter = choice.strip().lower()
+            
             # Placer la tuile temporairement
-            self.tiles_placed.append((row, col, self.selected_letter))
+            self.tiles_placed.append((row, col, letter))
             
             # Retirer du chevalet virtuel
             self.selected_letter = None
@@ -1157,14 +2136,71 @@ class ScrabbleGUI:
         else:
             self.message_label.config(text=message)
     
+    def _on_difficulty_change(self, event=None):
+        """Applique le niveau choisi ; temps de réflexion et simulation reprennent ceux du niveau"""
+        self.ai.set_difficulty(self.difficulty_var.get())
+        self.time_limit_var.set(self.ai.time_limit)
+        self.simulation_var.set(self.ai.simulation)
+    
+    def _on_simulation_change(self):
+        self.ai.simulation = self.simulation_var.get()
+    
     def _ai_play(self):
-        """Fait jouer l'IA"""
+        """Lance la réflexion de l'IA dans un thread pour garder l'interface fluide"""
         self.message_label.config(text="L'IA réfléchit...")
-        self.root.update()
         
-        # Trouver le meilleur coup
-        best_move = self.ai.find_best_move()
+        self.ai.time_limit = self.time_limit_var.get()
+        self.ai.stop_event.clear()
+        self.ai_cancelled = False
+        self.ai_started = time.perf_counter()
+        self.ai_results = queue.Queue()
+        threading.Thread(target=self._ai_worker, daemon=True).start()
+        
+        self.ai_stop_btn.config(state=tk.NORMAL)
+        self.ai_cancel_btn.config(state=tk.NORMAL)
+        self.root.after(AI_POLL_MS, self._poll_ai)
+    
+    def _ai_worker(self):
+        """Thread de recherche : le résultat est relevé par _poll_ai"""
+        best_move = None
+        try:
+            best_move = self.ai.find_best_move()
+        finally:
+            self.ai_results.put(best_move)
+    
+    def _poll_ai(self):
+        """Affiche la progression de l'IA et applique son coup une fois trouvé"""
+        try:
+            best_move = self.ai_results.get_nowait()
+        except queue.Empty:
+            elapsed = time.perf_counter() - self.ai_started
+            self.ai_progress['value'] = min(1.0, elapsed / max(self.ai.time_limit, 0.001))
+            self.ai_progress_label.config(text=f"{self.ai.progress} coups évalués, profondeur "
+                                               f"{self.ai.depth_reached} ({elapsed:.1f} s)")
+            self.root.after(AI_POLL_MS, self._poll_ai)
+            return
+        
+        self.ai_progress['value'] = 0
+        self.ai_progress_label.config(text=f"{self.ai.progress} coups évalués, profondeur "
+                                           f"{self.ai.depth_reached}")
+        self.ai_stop_btn.config(state=tk.DISABLED)
+        self.ai_cancel_btn.config(state=tk.DISABLED)
         
+        if self.ai_cancelled:
+            best_move = None
+        self._apply_ai_move(best_move)
+    
+    def _stop_ai(self):
+        """Arrête la recherche et joue le meilleur coup trouvé jusqu'ici"""
+        self.ai.request_stop()
+    
+    def _cancel_ai(self):
+        """Arrête la recherche ; l'IA passe son tour"""
+        self.ai_cancelled = True
+        self.ai.request_stop()
+    
+    def _apply_ai_move(self, best_move):
+        """Joue le coup choisi par l'IA (ou passe)"""
         if best_move:
             success, message, score = self.game.play_move(best_move)
             
@@ -1205,13 +2241,27 @@ class ScrabbleGUI:
         
         messagebox.showinfo("Fin de partie", message)
     
+    def _on_close(self):
+        """Arrête l'IA et ferme la fenêtre"""
+        self.ai.request_stop()
+        self.ai.close()
+        self.root.destroy()
+    
     def run(self):
         """Lance l'application"""
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         self.root.mainloop()
 
 
 # ==================== MAIN ====================
 
 if __name__ == "__main__":
-    app = ScrabbleGUI()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Scrabble contre une IA")
+    parser.add_argument('--lexique', metavar='FICHIER',
+                        help="liste de mots (un par ligne), compilée au premier lancement")
+    args = parser.parse_args()
+    
+    app = ScrabbleGUI(load_lexicon(args.lexique) if args.lexique else LEXICON)
     app.run()
@@ -0,0 +1,192 @@
+"""
+Tournoi IA contre IA sans interface, avec mesures de performance
+
+Usage : python tournament.py --parties 1000 [--processus 4] [--graine 0]
+                             [--profondeur 1 2] [--temps 0.5] [--niveaux normal expert]
+                             [--simulation 1] [--lexique mots.txt] [--json res.json]
+
+Avec --niveaux, chaque IA prend le préréglage de difficulté indiqué (profondeur,
+limites de génération et budget par tour), à la place de --profondeur et --temps.
+Les niveaux difficile et expert jouent par simulation Monte-Carlo. Avec
+--simulation, les IA indiquées (1 et/ou 2) simulent aussi, avec le même budget
+par tour. Avec --processus 1, les simulations utilisent tous les cœurs.
+
+Chaque partie utilise la graine (graine + numéro de partie) pour le mélange du
+sac, ce qui rend un tournoi reproductible d'une exécution à l'autre.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from scrabble import ScrabbleGame, ScrabbleAI, LEXICON, DIFFICULTY_LEVELS, load_lexicon
+
+# Lexique partagé par les parties d'un même processus
+_lexicon = LEXICON
+
+
+def _init_worker(lexicon):
+    global _lexicon
+    _lexicon = lexicon
+
+
+def play_game(seed, depths, time_limit, levels=None, simulated=(), sim_workers=1):
+    """Joue une partie complète et retourne ses statistiques"""
+    random.seed(seed)
+    game = ScrabbleGame(_lexicon, seed=seed)
+    game.add_player("IA 1", is_ai=True)
+    game.add_player("IA 2", is_ai=True)
+    ais = []
+    for idx, (depth, level) in enumerate(zip(depths, levels or [None, None])):
+        ai = ScrabbleAI(game, max_depth=depth, time_limit=time_limit, difficulty=level,
+                        workers=sim_workers)
+        if idx + 1 in simulated:
+            # Après le niveau, qui fixe aussi le mode de recherche
+            ai.simulation = True
+        ais.append(ai)
+    
+    start = time.perf_counter()
+    turns = 0
+    think_time = 0.0
+    max_think_time = 0.0
+    while not game.game_over:
+        ai = ais[game.current_player_idx]
+        turn_start = time.perf_counter()
+        best_move = ai.find_best_move()
+        turn_time = time.perf_counter() - turn_start
+        think_time += turn_time
+        max_think_time = max(max_think_time, turn_time)
+        turns += 1
+        
+        if best_move:
+            success, _, _ = game.play_move(best_move)
+            if success:
+                if not game.game_over:
+                    game.next_turn()
+                continue
+        game.pass_turn()
+    
+    for ai in ais:
+        ai.close()
+    return {
+        'seed': seed,
+        'scores': [player.score for player in game.players],
+        'turns': turns,
+        'duration': time.perf_counter() - start,
+        'think_time': think_time,
+        'max_think_time': max_think_time,
+        'generations': sum(ai.generation_count for ai in ais),
+        'generation_time': sum(ai.generation_time for ai in ais),
+        'moves_generated': sum(ai.moves_generated for ai in ais),
+        'search_cache_hits': sum(ai.search_cache.hits for ai in ais),
+        'search_cache_misses': sum(ai.search_cache.misses for ai in ais),
+    }
+
+
+def summarize(results, wall_time):
+    """Agrège les statistiques d'un tournoi"""
+    turns = sum(r['turns'] for r in results)
+    generations = sum(r['generations'] for r in results)
+    summary = {
+        'games': len(results),
+        'wall_time': wall_time,
+        'games_per_second': len(results) / wall_time if wall_time else 0.0,
+        'turns': turns,
+        'think_ms_per_turn': 1000 * sum(r['think_time'] for r in results) / max(turns, 1),
+        'max_think_ms': 1000 * max(r['max_think_time'] for r in results),
+        'generation_ms': 1000 * sum(r['generation_time'] for r in results) / max(generations, 1),
+        'generations_per_turn': generations / max(turns, 1),
+        'moves_per_generation': sum(r['moves_generated'] for r in results) / max(generations, 1),
+        'search_cache_hit_rate': sum(r['search_cache_hits'] for r in results)
+                                 / max(sum(r['search_cache_hits'] + r['search_cache_misses']
+                                           for r in results), 1),
+        'players': [],
+    }
+    
+    for idx in range(2):
+        scores = [r['scores'][idx] for r in results]
+        wins = sum(1 for r in results if r['scores'][idx] > r['scores'][1 - idx])
+        summary['players'].append({
+            'wins': wins,
+            'mean': statistics.mean(scores),
+            'stdev': statistics.stdev(scores) if len(scores) > 1 else 0.0,
+            'min': min(scores),
+            'median': statistics.median(scores),
+            'max': max(scores),
+            'deciles': statistics.quantiles(scores, n=10, method='inclusive') if len(scores) > 1 else scores,
+        })
+    summary['draws'] = sum(1 for r in results if r['scores'][0] == r['scores'][1])
+    return summary
+
+
+def print_report(summary, labels):
+    print(f"Parties : {summary['games']} en {summary['wall_time']:.1f} s "
+          f"({summary['games_per_second']:.2f} parties/s)")
+    print(f"Tours : {summary['turns']}, réflexion moyenne {summary['think_ms_per_turn']:.1f} ms/tour, "
+          f"maximum {summary['max_think_ms']:.0f} ms")
+    print(f"Génération : {summary['generation_ms']:.2f} ms en moyenne, "
+          f"{summary['generations_per_turn']:.1f} générations/tour, "
+          f"{summary['moves_per_generation']:.1f} coups/génération")
+    print(f"Cache de la recherche : {100 * summary['search_cache_hit_rate']:.0f} % de succès")
+    for idx, (player, label) in enumerate(zip(summary['players'], labels)):
+        print(f"IA {idx + 1} ({label}) : {player['wins']} victoires, "
+              f"score {player['mean']:.1f} ± {player['stdev']:.1f} "
+              f"[min {player['min']}, médiane {player['median']:.0f}, max {player['max']}]")
+        print("    déciles : " + " ".join(f"{d:.0f}" for d in player['deciles']))
+    print(f"Égalités : {summary['draws']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tournoi Scrabble IA contre IA sans interface")
+    parser.add_argument('--parties', type=int, default=100, help="nombre de parties")
+    parser.add_argument('--processus', type=int, default=os.cpu_count() or 1,
+                        help="nombre de processus de jeu")
+    parser.add_argument('--graine', type=int, default=0, help="graine de la première partie")
+    parser.add_argument('--profondeur', type=int, nargs=2, default=[1, 1], metavar=('IA1', 'IA2'),
+                        help="profondeur de recherche de chaque IA")
+    parser.add_argument('--temps', type=float, default=0.5, help="budget de réflexion par tour (s)")
+    parser.add_argument('--niveaux', nargs=2, choices=list(DIFFICULTY_LEVELS), metavar=('IA1', 'IA2'),
+                        help="niveau de difficulté de chaque IA (" + ", ".join(DIFFICULTY_LEVELS) + ")")
+    parser.add_argument('--simulation', type=int, nargs='+', choices=[1, 2], default=[],
+                        metavar='IA', help="IA jouant par simulation Monte-Carlo (1, 2 ou 1 2)")
+    parser.add_argument('--lexique', metavar='FICHIER', help="liste de mots à utiliser")
+    parser.add_argument('--json', metavar='FICHIER', help="écrit le résumé et les parties en JSON")
+    args = parser.parse_args()
+    
+    lexicon = load_lexicon(args.lexique) if args.lexique else LEXICON
+    seeds = range(args.graine, args.graine + args.parties)
+    
+    start = time.perf_counter()
+    if args.processus <= 1:
+        results = [play_game(seed, args.profondeur, args.temps, args.niveaux, args.simulation,
+                             os.cpu_count() or 1)
+                   for seed in seeds]
+    else:
+        with ProcessPoolExecutor(max_workers=args.processus, initializer=_init_worker,
+                                 initargs=(lexicon,)) as executor:
+            results = list(executor.map(play_game, seeds,
+                                        [args.profondeur] * args.parties,
+                                        [args.temps] * args.parties,
+                                        [args.niveaux] * args.parties,
+                                        [args.simulation] * args.parties,
+                                        chunksize=max(1, args.parties // (4 * args.processus))))
+    summary = summarize(results, time.perf_counter() - start)
+    
+    if args.niveaux:
+        labels = [f"niveau {level}" for level in args.niveaux]
+    else:
+        labels = [f"profondeur {depth}" for depth in args.profondeur]
+    labels = [label + (", simulation" if idx + 1 in args.simulation else "")
+              for idx, label in enumerate(labels)]
+    print_report(summary, labels)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'summary': summary, 'games': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()